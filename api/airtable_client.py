@@ -6,22 +6,168 @@ Handles all interactions with Airtable base for storing and retrieving data.
 
 import logging
 from typing import Dict, Any, List, Optional
-from datetime import datetime, date
+from datetime import date
+from copy import copy
+from functools import wraps
+from types import MappingProxyType
 import asyncio
 
-from pyairtable import Api, Base, Table
+import httpx
+from cachetools import TTLCache
+from pyairtable import Api, Table
+
+from utils.retry_utils import retry_async, AIRTABLE_RETRY_CONFIG
 
 logger = logging.getLogger(__name__)
 
+# Airtable rejects create requests with more records than this
+MAX_RECORDS_PER_REQUEST = 10
+# Batch-create requests in flight at once; Airtable allows 5 requests/second per base
+MAX_CONCURRENT_WRITES = 5
+
+# Errors on which a create POST is safe to resend: 429 rate-limit responses (raised as
+# HTTPStatusError below) and failures to connect, where the request never reached Airtable
+_RETRYABLE_WRITE_ERRORS = (httpx.HTTPStatusError, httpx.ConnectError, httpx.ConnectTimeout)
+
+# One pyairtable Api (and its requests session) per token, shared by every client
+_API_CACHE: Dict[str, Api] = {}
+
+# Field mappings for Petty Cash table
+_PETTY_CASH_FIELDS = MappingProxyType({
+    'person': 'Person',
+    'amount': 'Amount',
+    'description': 'Description',
+    'date': 'Date',
+    'receipt_photo': 'Receipt Photo',
+    'theoretical_balance': 'Theoretical Balance',
+    'actual_balance': 'Actual Balance',
+    'reconciliation_diff': 'Reconciliation Diff'
+})
+
+# Field mappings for Fuel Logs table
+_FUEL_LOG_FIELDS = MappingProxyType({
+    'driver': 'Driver',
+    'vehicle': 'Vehicle',
+    'date': 'Date',
+    'liters': 'Liters',
+    'odometer_start': 'Odometer Start',
+    'odometer_end': 'Odometer End',
+    'purpose': 'Purpose',
+    'logged_by': 'Logged By',
+    'kms_travelled': 'KMs Travelled',
+    'fuel_efficiency': 'Fuel Efficiency'
+})
+
+# Field mappings for Tasks table
+_TASKS_FIELDS = MappingProxyType({
+    'task_title': 'Task',
+    'details': 'Details',
+    'status': 'Status',
+    'deadline': 'Deadline',
+    'assigned_to': 'Assigned To',
+    'created_at': 'Created At',
+    'notes': 'Notes'
+})
+
+# Field mappings for Issues table
+_ISSUES_FIELDS = MappingProxyType({
+    'reported_by': 'Reported By',
+    'category': 'Category',
+    'description': 'Description',
+    'severity': 'Severity',
+    'date': 'Date',
+    'status': 'Status',
+    'resolution_notes': 'Resolution Notes'
+})
+
+# Valid vehicle options, in display order
+VALID_VEHICLES_LIST = ('Toyota Hilux', 'Toyota Prado', 'Other')
+
+# Default field values each new record starts from
+_EXPENSE_TEMPLATE = {_PETTY_CASH_FIELDS['person']: "Me"}
+_FUEL_LOG_TEMPLATE = {_FUEL_LOG_FIELDS['purpose']: "", _FUEL_LOG_FIELDS['logged_by']: "Me"}
+_TASK_TEMPLATE = {_TASKS_FIELDS['status']: "To Do", _TASKS_FIELDS['assigned_to']: "Nthambi"}
+_ISSUE_TEMPLATE = {
+    _ISSUES_FIELDS['severity']: "Low",
+    _ISSUES_FIELDS['status']: "Open",
+    _ISSUES_FIELDS['reported_by']: "Nthambi"
+}
+
+# Input keys each create writes: required keys must be present (KeyError otherwise),
+# optional keys are only sent when non-empty
+_EXPENSE_REQUIRED = ('date', 'amount', 'description')
+_EXPENSE_OPTIONAL = ('person',)
+_FUEL_LOG_REQUIRED = ('date', 'driver', 'liters')
+_FUEL_LOG_OPTIONAL = ('vehicle', 'purpose', 'logged_by', 'odometer_start', 'odometer_end')
+_TASK_REQUIRED = ('task_title',)
+_TASK_OPTIONAL = ('status', 'assigned_to', 'details', 'deadline', 'notes')
+_ISSUE_REQUIRED = ('description',)
+_ISSUE_OPTIONAL = ('severity', 'status', 'date', 'reported_by', 'category', 'resolution_notes')
+
+def _map_fields(
+    fields: MappingProxyType,
+    template: Dict[str, Any],
+    data: Dict[str, Any],
+    required: tuple,
+    optional: tuple
+) -> Dict[str, Any]:
+    """Copy a record template and overlay the listed input keys mapped to Airtable field names."""
+    record_data = template.copy()
+    for key in required:
+        record_data[fields[key]] = data[key]
+    for key in optional:
+        value = data.get(key)
+        if value is not None and value != "":
+            record_data[fields[key]] = value
+    return record_data
+
+def _fail_queued(queue: asyncio.Queue, error: Exception):
+    """Fail the futures of every write still waiting in a writer queue."""
+    while not queue.empty():
+        _, future = queue.get_nowait()
+        if not future.done():
+            future.set_exception(error)
+
+def _cached_read(description: str, fallback=None):
+    """Serve an async read from the client's TTL cache, keyed on method name and today's date.
+
+    Errors are logged and answered with fallback, which is never cached.
+    """
+    def decorator(method):
+        @wraps(method)
+        async def wrapper(self):
+            try:
+                value = await self._cached(method.__name__, lambda: method(self))
+            except Exception as e:
+                logger.error(f"Error getting {description}: {e}")
+                return copy(fallback)
+            return list(value) if isinstance(value, tuple) else value
+        return wrapper
+    return decorator
+
+def _get_api(api_key: str) -> Api:
+    """Return the shared Api for this token, creating it on first use."""
+    api = _API_CACHE.get(api_key)
+    if api is None:
+        api = _API_CACHE.setdefault(api_key, Api(api_key, timeout=(2, 10), retry_strategy=True))
+    return api
+
 class AirtableClient:
     """Handles Airtable operations."""
     
-    def __init__(self, api_key: str, base_id: str):
+    def __init__(self, api_key: str, base_id: str, max_batch_ms: int = 200):
         self.api_key = api_key
         self.base_id = base_id
+        # How long a burst of creates keeps collecting records before its request is sent
+        self.max_batch_ms = max_batch_ms
         # Initialize Airtable client
-        self.api = Api(api_key)
+        self.api = _get_api(api_key)
         self.base = self.api.base(base_id)
+        # Async HTTP client for writes so concurrent creates don't block the event loop;
+        # created on the loop that first writes, see _bind_loop()
+        self._http: Optional[httpx.AsyncClient] = None
+        self._write_slots: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
         
         # Table names and IDs (from actual Airtable base)
         self.petty_cash_table = "Petty Cash"
@@ -34,77 +180,92 @@ class AirtableClient:
         self.issues_table_id = "tblhmLkzbahZA5Afx"
         self.config_table = "Config"
         
-        # Field mappings for Petty Cash table
-        self.petty_cash_fields = {
-            'person': 'Person',
-            'amount': 'Amount',
-            'description': 'Description',
-            'date': 'Date',
-            'receipt_photo': 'Receipt Photo',
-            'theoretical_balance': 'Theoretical Balance',
-            'actual_balance': 'Actual Balance',
-            'reconciliation_diff': 'Reconciliation Diff'
+        # pyairtable Table objects for reads, built once instead of per call
+        self._tables: Dict[str, Table] = {
+            name: self.base.table(name)
+            for name in [self.petty_cash_table, self.fuel_log_table, self.tasks_table, self.issues_table]
         }
         
-        # Field mappings for Fuel Logs table
-        self.fuel_log_fields = {
-            'driver': 'Driver',
-            'vehicle': 'Vehicle',
-            'date': 'Date',
-            'liters': 'Liters',
-            'odometer_start': 'Odometer Start',
-            'odometer_end': 'Odometer End',
-            'purpose': 'Purpose',
-            'logged_by': 'Logged By',
-            'kms_travelled': 'KMs Travelled',
-            'fuel_efficiency': 'Fuel Efficiency'
-        }
+        # Field mappings (input key -> Airtable field name)
+        self.petty_cash_fields = _PETTY_CASH_FIELDS
+        self.fuel_log_fields = _FUEL_LOG_FIELDS
+        self.tasks_fields = _TASKS_FIELDS
+        self.issues_fields = _ISSUES_FIELDS
         
-        # Field mappings for Tasks table
-        self.tasks_fields = {
-            'task_title': 'Task',
-            'details': 'Details',
-            'status': 'Status',
-            'deadline': 'Deadline',
-            'assigned_to': 'Assigned To',
-            'created_at': 'Created At',
-            'notes': 'Notes'
+        # Valid vehicle options
+        self.valid_vehicles = frozenset(VALID_VEHICLES_LIST)
+        
+        # Table IDs, record builders and pending batch buffers, keyed by table name
+        self._table_ids = {
+            self.petty_cash_table: self.petty_cash_table_id,
+            self.fuel_log_table: self.fuel_log_table_id,
+            self.tasks_table: self.tasks_table_id,
+            self.issues_table: self.issues_table_id
+        }
+        self._record_builders = {
+            self.petty_cash_table: self._build_expense_record,
+            self.fuel_log_table: self._build_fuel_log_record,
+            self.tasks_table: self._build_task_record,
+            self.issues_table: self._build_issue_record
         }
+        self._pending: Dict[str, List[Dict[str, Any]]] = {name: [] for name in self._record_builders}
         
-        # Field mappings for Issues table
-        self.issues_fields = {
-            'reported_by': 'Reported By',
-            'category': 'Category',
-            'description': 'Description',
-            'severity': 'Severity',
-            'date': 'Date',
-            'status': 'Status',
-            'resolution_notes': 'Resolution Notes'
+        # Short-lived cache for slowly-changing reads (today's entries, open items)
+        self._read_cache: TTLCache = TTLCache(maxsize=32, ttl=30)
+        self._cache_dependents = {
+            self.petty_cash_table: ("get_todays_expenses", "get_petty_cash_balance"),
+            self.fuel_log_table: ("get_todays_fuel_logs",),
+            self.tasks_table: ("get_pending_tasks",),
+            self.issues_table: ("get_open_issues",)
         }
         
-        # Valid vehicle options
-        self.valid_vehicles = ['Toyota Hilux', 'Toyota Prado', 'Other']
+        # Per-table write queues drained by a background writer task, started on first use
+        self._queues: Dict[str, asyncio.Queue] = {}
+        self._writer_tasks: Dict[str, asyncio.Task] = {}
+    
+    def _build_expense_record(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Map expense data to Petty Cash field names."""
+        record_data = _map_fields(_PETTY_CASH_FIELDS, _EXPENSE_TEMPLATE, data, _EXPENSE_REQUIRED, _EXPENSE_OPTIONAL)
+        
+        # Add receipt photo if provided
+        if data.get("receipt_url"):
+            record_data[_PETTY_CASH_FIELDS['receipt_photo']] = [{"url": data["receipt_url"]}]
+        
+        return record_data
+    
+    def _build_fuel_log_record(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Map fuel log data to Fuel Logs field names."""
+        record_data = _map_fields(_FUEL_LOG_FIELDS, _FUEL_LOG_TEMPLATE, data, _FUEL_LOG_REQUIRED, _FUEL_LOG_OPTIONAL)
+        
+        # Validate vehicle selection
+        vehicle = data.get("vehicle", "")
+        if vehicle not in self.valid_vehicles:
+            logger.warning(f"Invalid vehicle: {vehicle}. Valid options: {list(VALID_VEHICLES_LIST)}")
+            record_data[_FUEL_LOG_FIELDS['vehicle']] = "Other"  # Default to Other if invalid
+        
+        return record_data
+    
+    def _build_task_record(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Map task data to Tasks field names."""
+        record_data = _map_fields(_TASKS_FIELDS, _TASK_TEMPLATE, data, _TASK_REQUIRED, _TASK_OPTIONAL)
+        record_data[_TASKS_FIELDS['created_at']] = data.get("date") or date.today().isoformat()
+        return record_data
+    
+    def _build_issue_record(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Map issue data to Issues field names."""
+        record_data = _map_fields(_ISSUES_FIELDS, _ISSUE_TEMPLATE, data, _ISSUE_REQUIRED, _ISSUE_OPTIONAL)
+        record_data[_ISSUES_FIELDS['date']] = record_data.get(_ISSUES_FIELDS['date']) or date.today().isoformat()
+        return record_data
     
     async def create_expense(self, data: Dict[str, Any]) -> Optional[str]:
         """Create a new expense record in Petty Cash table."""
         try:
-            table = self.base.table(self.petty_cash_table)
+            record_data = self._build_expense_record(data)
             
-            # Map data to Airtable field names
-            record_data = {
-                self.petty_cash_fields['date']: data["date"],
-                self.petty_cash_fields['amount']: data["amount"],
-                self.petty_cash_fields['description']: data["description"],
-                self.petty_cash_fields['person']: data.get("person", "Me")
-            }
-            
-            # Add receipt photo if provided
-            if data.get("receipt_url"):
-                record_data[self.petty_cash_fields['receipt_photo']] = [{"url": data["receipt_url"]}]
-            
-            record = table.create(record_data)
-            logger.info(f"Created expense record: {record['id']}")
-            return record["id"]
+            record_id = await self._enqueue(self.petty_cash_table, record_data)
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Created expense record: %s", record_id)
+            return record_id
             
         except Exception as e:
             logger.error(f"Error creating expense: {e}")
@@ -113,33 +274,12 @@ class AirtableClient:
     async def create_fuel_log(self, data: Dict[str, Any]) -> Optional[str]:
         """Create a new fuel log record."""
         try:
-            table = self.base.table(self.fuel_log_table)
+            record_data = self._build_fuel_log_record(data)
             
-            # Validate vehicle selection
-            vehicle = data.get("vehicle", "")
-            if vehicle not in self.valid_vehicles:
-                logger.warning(f"Invalid vehicle: {vehicle}. Valid options: {self.valid_vehicles}")
-                vehicle = "Other"  # Default to Other if invalid
-            
-            # Map data to Airtable field names
-            record_data = {
-                self.fuel_log_fields['date']: data["date"],
-                self.fuel_log_fields['vehicle']: vehicle,
-                self.fuel_log_fields['driver']: data["driver"],
-                self.fuel_log_fields['liters']: data["liters"],
-                self.fuel_log_fields['purpose']: data.get("purpose", ""),
-                self.fuel_log_fields['logged_by']: data.get("logged_by", "Me")
-            }
-            
-            # Add odometer readings if provided
-            if data.get("odometer_start"):
-                record_data[self.fuel_log_fields['odometer_start']] = data["odometer_start"]
-            if data.get("odometer_end"):
-                record_data[self.fuel_log_fields['odometer_end']] = data["odometer_end"]
-            
-            record = table.create(record_data)
-            logger.info(f"Created fuel log record: {record['id']}")
-            return record["id"]
+            record_id = await self._enqueue(self.fuel_log_table, record_data)
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Created fuel log record: %s", record_id)
+            return record_id
             
         except Exception as e:
             logger.error(f"Error creating fuel log: {e}")
@@ -148,29 +288,12 @@ class AirtableClient:
     async def create_task(self, data: Dict[str, Any]) -> Optional[str]:
         """Create a new task record."""
         try:
-            table = self.base.table(self.tasks_table)
-            
-            # Map data to Airtable field names
-            record_data = {
-                self.tasks_fields['task_title']: data["task_title"],
-                self.tasks_fields['status']: data.get("status", "To Do"),
-                self.tasks_fields['assigned_to']: data.get("assigned_to", "Nthambi"),
-                self.tasks_fields['created_at']: data.get("date", datetime.now().strftime("%Y-%m-%d"))
-            }
-            
-            # Add optional fields if provided
-            if data.get("details"):
-                record_data[self.tasks_fields['details']] = data["details"]
+            record_data = self._build_task_record(data)
             
-            if data.get("deadline"):
-                record_data[self.tasks_fields['deadline']] = data["deadline"]
-            
-            if data.get("notes"):
-                record_data[self.tasks_fields['notes']] = data["notes"]
-            
-            record = table.create(record_data)
-            logger.info(f"Created task record: {record['id']}")
-            return record["id"]
+            record_id = await self._enqueue(self.tasks_table, record_data)
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Created task record: %s", record_id)
+            return record_id
             
         except Exception as e:
             logger.error(f"Error creating task: {e}")
@@ -179,106 +302,298 @@ class AirtableClient:
     async def create_issue(self, data: Dict[str, Any]) -> Optional[str]:
         """Create a new issue record."""
         try:
-            table = self.base.table(self.issues_table)
-            
-            # Map data to Airtable field names
-            record_data = {
-                self.issues_fields['description']: data["description"],
-                self.issues_fields['severity']: data.get("severity", "Low"),
-                self.issues_fields['status']: data.get("status", "Open"),
-                self.issues_fields['date']: data.get("date", datetime.now().strftime("%Y-%m-%d")),
-                self.issues_fields['reported_by']: data.get("reported_by", "Nthambi")
-            }
+            record_data = self._build_issue_record(data)
             
-            # Add optional fields if provided
-            if data.get("category"):
-                record_data[self.issues_fields['category']] = data["category"]
-            
-            if data.get("resolution_notes"):
-                record_data[self.issues_fields['resolution_notes']] = data["resolution_notes"]
-            
-            record = table.create(record_data)
-            logger.info(f"Created issue record: {record['id']}")
-            return record["id"]
+            record_id = await self._enqueue(self.issues_table, record_data)
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Created issue record: %s", record_id)
+            return record_id
             
         except Exception as e:
             logger.error(f"Error creating issue: {e}")
             return None
     
+    async def create_expense_bulk(self, data_list: List[Dict[str, Any]]) -> List[Optional[str]]:
+        """Create several expense records using batched requests."""
+        records = [self._build_expense_record(data) for data in data_list]
+        return await self._batch_create(self.petty_cash_table, records)
+    
+    async def create_fuel_log_bulk(self, data_list: List[Dict[str, Any]]) -> List[Optional[str]]:
+        """Create several fuel log records using batched requests."""
+        records = [self._build_fuel_log_record(data) for data in data_list]
+        return await self._batch_create(self.fuel_log_table, records)
+    
+    async def create_task_bulk(self, data_list: List[Dict[str, Any]]) -> List[Optional[str]]:
+        """Create several task records using batched requests."""
+        records = [self._build_task_record(data) for data in data_list]
+        return await self._batch_create(self.tasks_table, records)
+    
+    async def create_issue_bulk(self, data_list: List[Dict[str, Any]]) -> List[Optional[str]]:
+        """Create several issue records using batched requests."""
+        records = [self._build_issue_record(data) for data in data_list]
+        return await self._batch_create(self.issues_table, records)
+    
+    def queue_record(self, table_name: str, data: Dict[str, Any]):
+        """Queue a record to be written by the next flush() instead of immediately."""
+        self._pending[table_name].append(self._record_builders[table_name](data))
+    
+    async def flush(self) -> Dict[str, List[Optional[str]]]:
+        """Write all queued records and return the created record IDs per table."""
+        results = {}
+        for table_name, records in self._pending.items():
+            if records:
+                self._pending[table_name] = []
+                results[table_name] = await self._batch_create(table_name, records)
+        return results
+    
+    async def _batch_create(self, table_name: str, records: List[Dict[str, Any]]) -> List[Optional[str]]:
+        """Create records in chunks of MAX_RECORDS_PER_REQUEST, one request per chunk.
+        
+        Chunks are sent concurrently, at most MAX_CONCURRENT_WRITES at a time across the
+        client. Returns record IDs in input order, with None for records whose chunk failed.
+        """
+        table_id = self._table_ids[table_name]
+        self._bind_loop()
+        
+        async def create_chunk(chunk: List[Dict[str, Any]]) -> List[Optional[str]]:
+            try:
+                async with self._write_slots:
+                    created = await self._post_records(table_id, chunk)
+                if len(created) != len(chunk):
+                    raise RuntimeError(f"Airtable returned {len(created)} records for {len(chunk)} creates")
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info("Created %d %s records in one batch", len(created), table_name)
+                return [record["id"] for record in created]
+            except Exception as e:
+                logger.error(f"Error creating {table_name} batch: {e}")
+                return [None] * len(chunk)
+        
+        chunk_ids = await asyncio.gather(*(
+            create_chunk(records[start:start + MAX_RECORDS_PER_REQUEST])
+            for start in range(0, len(records), MAX_RECORDS_PER_REQUEST)
+        ))
+        return [record_id for ids in chunk_ids for record_id in ids]
+    
+    async def _enqueue(self, table_name: str, record_data: Dict[str, Any]) -> str:
+        """Hand a record to the table's writer task and wait for its record ID."""
+        queue = self._ensure_writer(table_name)
+        future = asyncio.get_running_loop().create_future()
+        await queue.put((record_data, future))
+        return await future
+    
+    def _bind_loop(self):
+        """Tie the HTTP client, queues and writer tasks to the running loop.
+        
+        When called from a different loop than before, writes still queued on the old
+        loop are failed rather than left waiting forever, and a fresh HTTP client is
+        created because httpx clients can't be shared across loops. The old client is
+        closed on its own loop.
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        
+        old_loop, queues, tasks = self._loop, list(self._queues.values()), list(self._writer_tasks.values())
+        old_http = self._http
+        self._queues = {}
+        self._writer_tasks = {}
+        if old_loop is not None and not old_loop.is_closed():
+            error = RuntimeError("AirtableClient moved to another event loop")
+            for task in tasks:
+                old_loop.call_soon_threadsafe(task.cancel)
+            for queue in queues:
+                old_loop.call_soon_threadsafe(_fail_queued, queue, error)
+            if old_http is not None:
+                asyncio.run_coroutine_threadsafe(old_http.aclose(), old_loop)
+        
+        self._http = httpx.AsyncClient(
+            base_url="https://api.airtable.com/v0",
+            headers={"Authorization": f"Bearer {self.api_key}"},
+            http2=True,
+            limits=httpx.Limits(max_connections=20)
+        )
+        self._write_slots = asyncio.Semaphore(MAX_CONCURRENT_WRITES)
+        self._loop = loop
+    
+    def _ensure_writer(self, table_name: str) -> asyncio.Queue:
+        """Start the writer task for a table if it isn't running on the current loop."""
+        self._bind_loop()
+        task = self._writer_tasks.get(table_name)
+        if task is None or task.done():
+            queue = self._queues.setdefault(table_name, asyncio.Queue())
+            self._writer_tasks[table_name] = asyncio.create_task(self._writer_loop(table_name, queue))
+        return self._queues[table_name]
+    
+    async def _writer_loop(self, table_name: str, queue: asyncio.Queue):
+        """Send queued creates as they arrive, coalescing bursts into one request per 10 records.
+        
+        A lone create is sent straight away; only when more records are already waiting
+        does the batch keep collecting for up to max_batch_ms.
+        """
+        table_id = self._table_ids[table_name]
+        loop = asyncio.get_running_loop()
+        batch = []
+        
+        try:
+            while True:
+                batch = [await queue.get()]
+                deadline = loop.time() + self.max_batch_ms / 1000
+                
+                while len(batch) < MAX_RECORDS_PER_REQUEST:
+                    if not queue.empty():
+                        batch.append(queue.get_nowait())
+                        continue
+                    timeout = deadline - loop.time()
+                    if len(batch) == 1 or timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+                
+                try:
+                    created = await self._post_records(table_id, [record_data for record_data, _ in batch])
+                    if len(created) != len(batch):
+                        # Records can't be matched to callers, so fail the whole batch
+                        raise RuntimeError(f"Airtable returned {len(created)} records for {len(batch)} creates")
+                    for (_, future), record in zip(batch, created):
+                        if not future.done():
+                            future.set_result(record["id"])
+                except Exception as e:
+                    logger.error(f"Error writing {table_name} batch of {len(batch)}: {e}")
+                    for _, future in batch:
+                        if not future.done():
+                            future.set_exception(e)
+                batch = []
+        
+        except asyncio.CancelledError:
+            # Don't leave callers waiting on writes that will never be sent
+            error = RuntimeError(f"{table_name} writer stopped")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+            _fail_queued(queue, error)
+            raise
+    
+    async def _post_records(self, table_id: str, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """POST up to MAX_RECORDS_PER_REQUEST records and return the created records.
+        
+        Rate-limit (429) responses and failures to connect are retried with exponential
+        backoff. Creates aren't idempotent, so anything else is raised immediately: after a
+        5xx or a read timeout Airtable may already have created the records.
+        """
+        payload = {"records": [{"fields": fields} for fields in records], "typecast": True}
+        
+        self._bind_loop()
+        
+        async def post() -> httpx.Response:
+            response = await self._http.post(f"/{self.base_id}/{table_id}", json=payload)
+            if response.status_code == 429:
+                response.raise_for_status()
+            return response
+        
+        response = await retry_async(post, config=AIRTABLE_RETRY_CONFIG, retry_on=_RETRYABLE_WRITE_ERRORS)
+        response.raise_for_status()
+        self._invalidate_reads(table_id)
+        return response.json()["records"]
+    
+    async def _cached(self, name: str, coro_fn):
+        """Return today's cached result for a read, awaiting coro_fn() on a miss.
+
+        Lists are stored as tuples so callers can't mutate the cached copy.
+        """
+        key = (name, date.today().isoformat())
+        try:
+            return self._read_cache[key]
+        except KeyError:
+            pass
+        
+        value = await coro_fn()
+        if isinstance(value, list):
+            value = tuple(value)
+        self._read_cache[key] = value
+        return value
+    
+    def _invalidate_reads(self, table_id: str):
+        """Evict cached reads that depend on the table that was just written."""
+        today = date.today().isoformat()
+        for table_name, dependents in self._cache_dependents.items():
+            if self._table_ids[table_name] == table_id:
+                for name in dependents:
+                    self._read_cache.pop((name, today), None)
+    
+    async def aclose(self):
+        """Stop the writer tasks, failing any unsent writes, and close the HTTP connection pool."""
+        tasks = list(self._writer_tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._writer_tasks.clear()
+        
+        error = RuntimeError("AirtableClient closed")
+        for queue in self._queues.values():
+            _fail_queued(queue, error)
+        self._queues.clear()
+        
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+        self._loop = None
+    
+    @_cached_read("today's expenses", [])
     async def get_todays_expenses(self) -> List[Dict[str, Any]]:
         """Get all expenses for today."""
-        try:
-            # TODO: Implement Airtable query
-            # table = self.base.table(self.petty_cash_table)
-            # today = date.today().isoformat()
-            # records = table.all(formula=f"{{Date}} = '{today}'")
-            # return [record["fields"] for record in records]
-            
-            logger.info("Would get today's expenses")
-            return []
-            
-        except Exception as e:
-            logger.error(f"Error getting today's expenses: {e}")
-            return []
+        # TODO: Implement Airtable query
+        # table = self._tables[self.petty_cash_table]
+        # today = date.today().isoformat()
+        # records = table.all(formula=f"{{Date}} = '{today}'")
+        # return [record["fields"] for record in records]
+        
+        logger.info("Would get today's expenses")
+        return []
     
+    @_cached_read("today's fuel logs", [])
     async def get_todays_fuel_logs(self) -> List[Dict[str, Any]]:
         """Get all fuel logs for today."""
-        try:
-            # TODO: Implement Airtable query
-            # table = self.base.table(self.fuel_log_table)
-            # today = date.today().isoformat()
-            # records = table.all(formula=f"{{Date}} = '{today}'")
-            # return [record["fields"] for record in records]
-            
-            logger.info("Would get today's fuel logs")
-            return []
-            
-        except Exception as e:
-            logger.error(f"Error getting today's fuel logs: {e}")
-            return []
+        # TODO: Implement Airtable query
+        # table = self._tables[self.fuel_log_table]
+        # today = date.today().isoformat()
+        # records = table.all(formula=f"{{Date}} = '{today}'")
+        # return [record["fields"] for record in records]
+        
+        logger.info("Would get today's fuel logs")
+        return []
     
+    @_cached_read("pending tasks", [])
     async def get_pending_tasks(self) -> List[Dict[str, Any]]:
         """Get all pending tasks."""
-        try:
-            # TODO: Implement Airtable query
-            # table = self.base.table(self.tasks_table)
-            # records = table.all(formula="OR({Status} = 'To Do', {Status} = 'In Progress')")
-            # return [record["fields"] for record in records]
-            
-            logger.info("Would get pending tasks")
-            return []
-            
-        except Exception as e:
-            logger.error(f"Error getting pending tasks: {e}")
-            return []
+        # TODO: Implement Airtable query
+        # table = self._tables[self.tasks_table]
+        # records = table.all(formula="OR({Status} = 'To Do', {Status} = 'In Progress')")
+        # return [record["fields"] for record in records]
+        
+        logger.info("Would get pending tasks")
+        return []
     
+    @_cached_read("open issues", [])
     async def get_open_issues(self) -> List[Dict[str, Any]]:
         """Get all open issues."""
-        try:
-            # TODO: Implement Airtable query
-            # table = self.base.table(self.issues_table)
-            # records = table.all(formula="{Status} = 'Open'")
-            # return [record["fields"] for record in records]
-            
-            logger.info("Would get open issues")
-            return []
-            
-        except Exception as e:
-            logger.error(f"Error getting open issues: {e}")
-            return []
+        # TODO: Implement Airtable query
+        # table = self._tables[self.issues_table]
+        # records = table.all(formula="{Status} = 'Open'")
+        # return [record["fields"] for record in records]
+        
+        logger.info("Would get open issues")
+        return []
     
+    @_cached_read("petty cash balance")
     async def get_petty_cash_balance(self) -> Optional[float]:
         """Get current petty cash theoretical balance."""
-        try:
-            # TODO: Implement balance calculation
-            # This would need to query the config table for starting balance
-            # and calculate based on all expenses
-            logger.info("Would get petty cash balance")
-            return 100000.0  # Mock value
-            
-        except Exception as e:
-            logger.error(f"Error getting petty cash balance: {e}")
-            return None
+        # TODO: Implement balance calculation
+        # This would need to query the config table for starting balance
+        # and calculate based on all expenses
+        logger.info("Would get petty cash balance")
+        return 100000.0  # Mock value
     
     async def update_actual_balance(self, actual_balance: float) -> bool:
         """Update the actual petty cash balance for reconciliation."""
@@ -295,19 +610,28 @@ class AirtableClient:
     async def get_all_data_for_export(self) -> Dict[str, List[Dict[str, Any]]]:
         """Get all data for export functionality."""
         try:
-            # TODO: Implement comprehensive data retrieval
-            # This would get all records from all tables for the export period
-            logger.info("Would get all data for export")
+            # The four tables are independent, so fetch them concurrently
+            petty_cash, fuel_logs, tasks, issues = await asyncio.gather(
+                self._all_async(self.petty_cash_table),
+                self._all_async(self.fuel_log_table),
+                self._all_async(self.tasks_table),
+                self._all_async(self.issues_table)
+            )
             return {
-                "petty_cash": [],
-                "fuel_logs": [],
-                "tasks": [],
-                "issues": []
+                "petty_cash": petty_cash,
+                "fuel_logs": fuel_logs,
+                "tasks": tasks,
+                "issues": issues
             }
             
         except Exception as e:
             logger.error(f"Error getting data for export: {e}")
             return {}
+    
+    async def _all_async(self, table_name: str, **options) -> List[Dict[str, Any]]:
+        """Fetch the fields of every matching record without blocking the event loop."""
+        records = await asyncio.to_thread(self._tables[table_name].all, **options)
+        return [record["fields"] for record in records]
 
 # Global client instance (to be initialized with API key and base ID)
 client: Optional[AirtableClient] = None 
\ No newline at end of file
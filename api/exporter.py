@@ -6,19 +6,50 @@ Handles generation of export files with all data for end-of-run reporting.
 
 import logging
 from typing import Dict, Any, List, Optional
-from datetime import datetime, date
+from datetime import datetime
+import asyncio
+import io
 import os
-import tempfile
+import time
+from collections import Counter
+from functools import lru_cache
 
-# TODO: Import dependencies once configured
-# import pandas as pd
-# from openpyxl import Workbook
-# from openpyxl.styles import Font, PatternFill
-# from reportlab.lib.pagesizes import letter
-# from reportlab.platypus import SimpleDocTemplate, Table, TableStyle
+import aiofiles
+import xlsxwriter
+
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Table
 
 logger = logging.getLogger(__name__)
 
+
+@lru_cache(maxsize=128)
+def _url_for(basename: str) -> str:
+    """Download URL for an export file name."""
+    return f"https://example.com/downloads/{basename}"
+
+
+# Export sheet layouts: (data key, sheet name, [(column header, default value), ...])
+EXPORT_SHEETS = [
+    ("petty_cash", "Petty Cash", [
+        ("Date", ""), ("Amount", 0), ("Description", ""), ("Person", ""),
+        ("Theoretical Balance", 0), ("Actual Balance", ""), ("Reconciliation Diff", "")
+    ]),
+    ("fuel_logs", "Fuel Log", [
+        ("Date", ""), ("Vehicle", ""), ("Driver", ""), ("Liters", 0),
+        ("Odometer Start", ""), ("Odometer End", ""), ("KMs Travelled", 0), ("Purpose", "")
+    ]),
+    ("tasks", "Tasks", [
+        ("Task", ""), ("Details", ""), ("Status", ""), ("Deadline", ""),
+        ("Assigned To", ""), ("Created At", ""), ("Notes", "")
+    ]),
+    ("issues", "Issues", [
+        ("Date", ""), ("Category", ""), ("Description", ""), ("Severity", ""),
+        ("Reported By", ""), ("Status", ""), ("Resolution Notes", "")
+    ]),
+]
+
 class Exporter:
     """Handles export functionality for service station data."""
     
@@ -29,33 +60,12 @@ class Exporter:
     async def generate_excel_export(self, data: Dict[str, List[Dict[str, Any]]]) -> Optional[str]:
         """Generate Excel export with all data."""
         try:
-            # TODO: Implement Excel generation
-            # workbook = Workbook()
-            # 
-            # # Remove default sheet
-            # workbook.remove(workbook.active)
-            # 
-            # # Create sheets for each table
-            # self._create_petty_cash_sheet(workbook, data.get("petty_cash", []))
-            # self._create_fuel_log_sheet(workbook, data.get("fuel_logs", []))
-            # self._create_tasks_sheet(workbook, data.get("tasks", []))
-            # self._create_issues_sheet(workbook, data.get("issues", []))
-            # self._create_summary_sheet(workbook, data)
-            # 
-            # # Save file
-            # timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            # filename = f"service_station_export_{timestamp}.xlsx"
-            # filepath = os.path.join(self.export_dir, filename)
-            # workbook.save(filepath)
-            
-            # Mock implementation
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            timestamp = time.strftime("%Y%m%d_%H%M%S")
             filename = f"service_station_export_{timestamp}.xlsx"
             filepath = os.path.join(self.export_dir, filename)
             
-            # Create empty file for now
-            with open(filepath, 'w') as f:
-                f.write("Mock Excel export - not yet implemented")
+            # Workbook writing is blocking disk I/O; keep it off the event loop
+            await asyncio.to_thread(self._write_workbook, filepath, data)
             
             logger.info(f"Generated Excel export: {filepath}")
             return filepath
@@ -64,149 +74,76 @@ class Exporter:
             logger.error(f"Error generating Excel export: {e}")
             return None
     
-    def _create_petty_cash_sheet(self, workbook, data: List[Dict[str, Any]]):
-        """Create Petty Cash sheet in Excel workbook."""
-        # TODO: Implement sheet creation
-        # sheet = workbook.create_sheet("Petty Cash")
-        # 
-        # # Headers
-        # headers = ["Date", "Amount", "Description", "Person", "Theoretical Balance", "Actual Balance", "Reconciliation Diff"]
-        # sheet.append(headers)
-        # 
-        # # Data
-        # for record in data:
-        #     row = [
-        #         record.get("Date", ""),
-        #         record.get("Amount", 0),
-        #         record.get("Description", ""),
-        #         record.get("Person", ""),
-        #         record.get("Theoretical Balance", 0),
-        #         record.get("Actual Balance", ""),
-        #         record.get("Reconciliation Diff", "")
-        #     ]
-        #     sheet.append(row)
-        pass
-    
-    def _create_fuel_log_sheet(self, workbook, data: List[Dict[str, Any]]):
-        """Create Fuel Log sheet in Excel workbook."""
-        # TODO: Implement sheet creation
-        # sheet = workbook.create_sheet("Fuel Log")
-        # 
-        # # Headers
-        # headers = ["Date", "Vehicle", "Driver", "Liters", "Odometer Start", "Odometer End", "KMs Travelled", "Purpose"]
-        # sheet.append(headers)
-        # 
-        # # Data
-        # for record in data:
-        #     row = [
-        #         record.get("Date", ""),
-        #         record.get("Vehicle", ""),
-        #         record.get("Driver", ""),
-        #         record.get("Liters", 0),
-        #         record.get("Odometer Start", ""),
-        #         record.get("Odometer End", ""),
-        #         record.get("KMs Travelled", 0),
-        #         record.get("Purpose", "")
-        #     ]
-        #     sheet.append(row)
-        pass
+    def _write_workbook(self, filepath: str, data: Dict[str, List[Dict[str, Any]]]):
+        """Write all export sheets to an .xlsx file."""
+        # constant_memory flushes each row to disk once the next one starts,
+        # so memory stays flat however many records the export contains
+        workbook = xlsxwriter.Workbook(filepath, {'constant_memory': True, 'strings_to_numbers': False})
+        
+        # Create sheets for each table
+        for data_key, sheet_name, columns in EXPORT_SHEETS:
+            self._write_sheet(workbook, sheet_name, columns, data.get(data_key, []))
+        self._create_summary_sheet(workbook, data)
+        
+        workbook.close()
     
-    def _create_tasks_sheet(self, workbook, data: List[Dict[str, Any]]):
-        """Create Tasks sheet in Excel workbook."""
-        # TODO: Implement sheet creation
-        # sheet = workbook.create_sheet("Tasks")
-        # 
-        # # Headers
-        # headers = ["Task", "Details", "Status", "Deadline", "Assigned To", "Created At", "Notes"]
-        # sheet.append(headers)
-        # 
-        # # Data
-        # for record in data:
-        #     row = [
-        #         record.get("Task", ""),
-        #         record.get("Details", ""),
-        #         record.get("Status", ""),
-        #         record.get("Deadline", ""),
-        #         record.get("Assigned To", ""),
-        #         record.get("Created At", ""),
-        #         record.get("Notes", "")
-        #     ]
-        #     sheet.append(row)
-        pass
-    
-    def _create_issues_sheet(self, workbook, data: List[Dict[str, Any]]):
-        """Create Issues sheet in Excel workbook."""
-        # TODO: Implement sheet creation
-        # sheet = workbook.create_sheet("Issues")
-        # 
-        # # Headers
-        # headers = ["Date", "Category", "Description", "Severity", "Reported By", "Status", "Resolution Notes"]
-        # sheet.append(headers)
-        # 
-        # # Data
-        # for record in data:
-        #     row = [
-        #         record.get("Date", ""),
-        #         record.get("Category", ""),
-        #         record.get("Description", ""),
-        #         record.get("Severity", ""),
-        #         record.get("Reported By", ""),
-        #         record.get("Status", ""),
-        #         record.get("Resolution Notes", "")
-        #     ]
-        #     sheet.append(row)
-        pass
+    def _write_sheet(self, workbook, sheet_name: str, columns: List[tuple], data: List[Dict[str, Any]]):
+        """Write one table's records to a new sheet, one row per record."""
+        sheet = workbook.add_worksheet(sheet_name)
+        headers = [header for header, _ in columns]
+        sheet.write_row(0, 0, headers)
+        
+        for row_num, record in enumerate(data, 1):
+            sheet.write_row(row_num, 0, [record.get(header, default) for header, default in columns])
     
     def _create_summary_sheet(self, workbook, data: Dict[str, List[Dict[str, Any]]]):
         """Create Summary sheet in Excel workbook."""
-        # TODO: Implement summary sheet
-        # sheet = workbook.create_sheet("Summary")
-        # 
-        # # Summary statistics
-        # summary_data = [
-        #     ["Metric", "Value"],
-        #     ["Total Expenses", len(data.get("petty_cash", []))],
-        #     ["Total Fuel Logs", len(data.get("fuel_logs", []))],
-        #     ["Total Tasks", len(data.get("tasks", []))],
-        #     ["Total Issues", len(data.get("issues", []))],
-        #     ["Pending Tasks", len([t for t in data.get("tasks", []) if t.get("Status") in ["To Do", "In Progress"]])],
-        #     ["Open Issues", len([i for i in data.get("issues", []) if i.get("Status") == "Open"])],
-        # ]
-        # 
-        # for row in summary_data:
-        #     sheet.append(row)
-        pass
+        sheet = workbook.add_worksheet("Summary")
+        
+        # One pass per table counts every status at once
+        counts = Counter()
+        for table in ("tasks", "issues"):
+            counts.update((table, record.get("Status")) for record in data.get(table, []))
+        
+        pending_tasks = counts[("tasks", "To Do")] + counts[("tasks", "In Progress")]
+        open_issues = counts[("issues", "Open")]
+        
+        # Summary statistics
+        summary_data = [
+            ["Metric", "Value"],
+            ["Total Expenses", len(data.get("petty_cash", []))],
+            ["Total Fuel Logs", len(data.get("fuel_logs", []))],
+            ["Total Tasks", len(data.get("tasks", []))],
+            ["Total Issues", len(data.get("issues", []))],
+            ["Pending Tasks", pending_tasks],
+            ["Open Issues", open_issues],
+        ]
+        
+        for row_num, row in enumerate(summary_data):
+            sheet.write_row(row_num, 0, row)
     
     async def generate_pdf_summary(self, data: Dict[str, List[Dict[str, Any]]]) -> Optional[str]:
         """Generate PDF summary report."""
         try:
-            # TODO: Implement PDF generation
-            # timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            # filename = f"service_station_summary_{timestamp}.pdf"
-            # filepath = os.path.join(self.export_dir, filename)
-            # 
-            # doc = SimpleDocTemplate(filepath, pagesize=letter)
-            # story = []
-            # 
-            # # Add title
-            # title = f"Service Station Operations Summary - {datetime.now().strftime('%B %d, %Y')}"
-            # story.append(Paragraph(title, getSampleStyleSheet()['Title']))
-            # 
-            # # Add summary table
-            # summary_data = self._generate_summary_table_data(data)
-            # table = Table(summary_data)
-            # story.append(table)
-            # 
-            # doc.build(story)
-            
-            # Mock implementation
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            now = time.localtime()
+            timestamp = time.strftime("%Y%m%d_%H%M%S", now)
             filename = f"service_station_summary_{timestamp}.pdf"
             filepath = os.path.join(self.export_dir, filename)
             
-            # Create empty file for now
-            with open(filepath, 'w') as f:
-                f.write("Mock PDF export - not yet implemented")
+            # Render in memory, then swap into place so no reader sees a partial PDF
+            title = f"Service Station Operations Summary - {time.strftime('%B %d, %Y', now)}"
+            pdf_bytes = await asyncio.to_thread(self._build_pdf, title, data)
+            
+            tmp_path = filepath + ".tmp"
+            try:
+                async with aiofiles.open(tmp_path, 'wb') as f:
+                    await f.write(pdf_bytes)
+                os.replace(tmp_path, filepath)
+            except BaseException:
+                # Don't leave a half-written .tmp behind in the export dir
+                if os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
+                raise
             
             logger.info(f"Generated PDF summary: {filepath}")
             return filepath
@@ -215,6 +152,17 @@ class Exporter:
             logger.error(f"Error generating PDF summary: {e}")
             return None
     
+    def _build_pdf(self, title: str, data: Dict[str, List[Dict[str, Any]]]) -> bytes:
+        """Render the summary PDF and return its bytes."""
+        buf = io.BytesIO()
+        doc = SimpleDocTemplate(buf, pagesize=letter)
+        story = [
+            Paragraph(title, getSampleStyleSheet()['Title']),
+            Table(self._generate_summary_table_data(data)),
+        ]
+        doc.build(story)
+        return buf.getvalue()
+    
     def _generate_summary_table_data(self, data: Dict[str, List[Dict[str, Any]]]) -> List[List[str]]:
         """Generate summary table data for PDF."""
         # TODO: Implement summary data generation
@@ -231,11 +179,12 @@ class Exporter:
         try:
             cutoff_time = datetime.now().timestamp() - (max_age_days * 24 * 60 * 60)
             
-            for filename in os.listdir(self.export_dir):
-                filepath = os.path.join(self.export_dir, filename)
-                if os.path.isfile(filepath) and os.path.getmtime(filepath) < cutoff_time:
-                    os.remove(filepath)
-                    logger.info(f"Cleaned up old export: {filename}")
+            # scandir entries carry cached type info, so each file costs one stat
+            with os.scandir(self.export_dir) as entries:
+                for entry in entries:
+                    if entry.is_file(follow_symlinks=False) and entry.stat().st_mtime < cutoff_time:
+                        os.remove(entry.path)
+                        logger.info(f"Cleaned up old export: {entry.name}")
                     
         except Exception as e:
             logger.error(f"Error cleaning up old exports: {e}")
@@ -245,7 +194,7 @@ class Exporter:
         # TODO: Implement file hosting/URL generation
         # This could upload to a cloud storage service or serve via web endpoint
         logger.info(f"Would generate download URL for: {filepath}")
-        return f"https://example.com/downloads/{os.path.basename(filepath)}"
+        return _url_for(os.path.basename(filepath))
 
 # Global exporter instance
 exporter = Exporter() 
\ No newline at end of file
@@ -4,16 +4,94 @@ GPT prompt construction + response interpretation for the service station operat
 Handles parsing of natural language messages into structured data for Airtable storage.
 """
 
+import asyncio
 import json
 import logging
-from typing import Dict, Any, Optional, Union
+import os
+import re
+from datetime import date, timedelta
+from typing import Dict, Any, Optional, Union, Callable
 from enum import Enum
-from pydantic import BaseModel
+from dataclasses import fields, replace
+from pydantic import ConfigDict, TypeAdapter, ValidationError
+from pydantic.dataclasses import dataclass
+from pydantic_core import from_json
+from cachetools import TTLCache
 
 import openai
 
 logger = logging.getLogger(__name__)
 
+# Keywords that mark a message as likely belonging to each entry type
+_CATEGORY_KEYWORDS = {
+    "fuel": ['liters', 'fuel', 'diesel', 'petrol', 'gas', 'hilux', 'prado', 'vehicle', 'car'],
+    "expense": ['spent', 'paid', 'cost', 'mwk', 'money', 'cash', 'expense'],
+    "task": ['assign', 'task', 'todo', 'deadline', 'prepare', 'inspect', 'check', 'review', 'complete', 'finish'],
+    "issue": ['problem', 'issue', 'broken', 'malfunction', 'urgent', 'critical', 'emergency', 'complaint', 'fault'],
+}
+# Zero-width lookahead so keywords are found at every position, even inside or overlapping other words
+_CATEGORY_RE = re.compile(
+    "(?=" + "|".join(
+        f"(?P<{kind}>{'|'.join(keywords)})" for kind, keywords in _CATEGORY_KEYWORDS.items()
+    ) + ")",
+    re.IGNORECASE
+)
+
+def _classify(message: str) -> set:
+    """Entry types whose keywords appear in the message, found in one regex pass."""
+    return {match.lastgroup for match in _CATEGORY_RE.finditer(message)}
+
+# Deadline phrases and the weekday they fall on, checked in this order ("next week" means next Monday)
+_DEADLINE_WEEKDAYS = {
+    "friday": 4,
+    "next week": 0,
+    "monday": 0,
+    "tuesday": 1,
+    "wednesday": 2,
+    "thursday": 3,
+    "saturday": 5,
+    "sunday": 6,
+}
+
+def _next_weekday(weekday: int) -> date:
+    """The next date (after today) falling on the given weekday, Monday being 0."""
+    today = date.today()
+    return today + timedelta(days=(weekday - today.weekday()) % 7 or 7)
+
+# Separator between entries in a multi-entry message, with surrounding whitespace
+_ENTRY_SPLIT_RE = re.compile(r'\s*;\s*')
+
+def split_entries(message: str) -> list[str]:
+    """Split a message into its semicolon-separated entries, dropping empty ones."""
+    return [entry for entry in _ENTRY_SPLIT_RE.split(message.strip()) if entry]
+
+# Keyword patterns used when reclassifying GPT output (matched against the lowercased message)
+_REFUEL_RE = re.compile(r'liters|used|gave|refueled')
+_SEV_HIGH_RE = re.compile(r'urgent|critical|emergency')
+_SEV_MEDIUM_RE = re.compile(r'important|priority')
+_CATEGORY_EQUIPMENT_RE = re.compile(r'equipment|machine|compressor|generator')
+_CATEGORY_SUPPLY_RE = re.compile(r'fuel|supply|material')
+_CATEGORY_COMPLAINT_RE = re.compile(r'complaint|customer|service')
+
+# Extractors used when reclassifying GPT output
+_LITERS_RE = re.compile(r'(\d+)\s*liters?')
+_ASSIGN_RE = re.compile(r'assign\s+(\w+)')
+
+# Extractors for the local (no GPT) fast path
+_LOCAL_LITERS_RE = re.compile(r'(\d+(?:\.\d+)?)\s*(?:l|liters?|litres?)\b')
+_LOCAL_DRIVER_RE = re.compile(r'\bdriver\s+([A-Za-z]+)', re.IGNORECASE)
+_LOCAL_ODOMETER_RE = re.compile(r'odometer\D*?(\d+)\D+?(\d+)')
+_LOCAL_PURPOSE_RE = re.compile(r'\bfor\s+([^.,;]+)', re.IGNORECASE)
+_LOCAL_VEHICLES = {"hilux": "Toyota Hilux", "prado": "Toyota Prado"}
+_LOCAL_EXPENSE_RE = re.compile(
+    r'^(?:paid|spent)\s+(?:mwk\s*)?(\d[\d,]*(?:\.\d+)?)\s*(?:mwk|kwacha)?\s+(?:for|on)\s+(.+?)(?:\s+from petty cash)?\.?$',
+    re.IGNORECASE
+)
+_LOCAL_ASSIGN_RE = re.compile(
+    r'^assign\s+([A-Za-z]+)\s+to\s+(.+?)(?:\s+by\s+(next week|monday|tuesday|wednesday|thursday|friday|saturday|sunday))?\.?$',
+    re.IGNORECASE
+)
+
 class EntryType(Enum):
     """Types of entries that can be logged."""
     EXPENSE = "expense"
@@ -21,7 +99,8 @@ class EntryType(Enum):
     TASK = "task"
     ISSUE = "issue"
 
-class ParsedEntry(BaseModel):
+@dataclass(frozen=True, slots=True, config=ConfigDict(extra='ignore'))
+class ParsedEntry:
     """Structured data extracted from user message."""
     type: EntryType
     date: Optional[str] = None  # YYYY-MM-DD format, will be set to today if missing
@@ -44,17 +123,60 @@ class ParsedEntry(BaseModel):
     severity: Optional[str] = None
     reported_by: Optional[str] = None
 
-class GPTParser:
-    """Handles GPT-based message parsing."""
-    
-    def __init__(self, api_key: str):
-        self.api_key = api_key
-        # Initialize OpenAI client
-        self.client = openai.OpenAI(api_key=api_key)
-    
-    def get_system_prompt(self) -> str:
-        """Get the system prompt for GPT."""
-        return """You are a structured logger for a service station operations system. 
+# Validates GPT output (JSON or dicts) straight into ParsedEntry
+_ENTRY_ADAPTER = TypeAdapter(ParsedEntry)
+
+# JSON types for ParsedEntry's optional fields
+_JSON_TYPES = {Optional[str]: "string", Optional[float]: "number", Optional[int]: "integer"}
+
+def _entry_json_schema() -> Dict[str, Any]:
+    """Strict-mode JSON schema for one ParsedEntry: every key present, unknown ones nullable."""
+    properties = {"type": {"type": "string", "enum": [entry_type.value for entry_type in EntryType]}}
+    for field in fields(ParsedEntry):
+        if field.name != "type":
+            properties[field.name] = {"type": [_JSON_TYPES[field.type], "null"]}
+    return {
+        "type": "object",
+        "properties": properties,
+        "required": list(properties),
+        "additionalProperties": False,
+    }
+
+# Structured outputs: OpenAI guarantees responses match these schemas
+_ENTRY_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {"name": "ParsedEntry", "schema": _entry_json_schema(), "strict": True},
+}
+_ENTRIES_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "ParsedEntries",
+        "schema": {
+            "type": "object",
+            "properties": {"entries": {"type": "array", "items": _entry_json_schema()}},
+            "required": ["entries"],
+            "additionalProperties": False,
+        },
+        "strict": True,
+    },
+}
+
+# Emoji and one-line summary for each entry type in multi-entry confirmations
+_ENTRY_EMOJI = {
+    EntryType.EXPENSE: "💰",
+    EntryType.FUEL: "⛽",
+    EntryType.TASK: "📋",
+    EntryType.ISSUE: "⚠️",
+}
+_SUMMARY_FMT = {
+    EntryType.EXPENSE: lambda entry: f"{entry.amount:,.0f} MWK - {entry.description}",
+    EntryType.FUEL: lambda entry: f"{entry.liters}L - {entry.vehicle}",
+    EntryType.TASK: lambda entry: f"{entry.task_title}",
+    EntryType.ISSUE: lambda entry: entry.description or entry.task_title or "No description",
+}
+
+# System prompt for GPT
+_SYSTEM_PROMPT = """You are a structured logger for a service station operations system. 
 
 Given a user message, classify it into one of: expense, fuel, task, issue. Extract relevant fields depending on type.
 
@@ -67,15 +189,15 @@ Output JSON with a type field and the appropriate keys:
 
 For vehicle selection in fuel logs, use: "Toyota Hilux", "Toyota Prado", or "Other"
 For amounts, extract numeric values only (e.g., "15,000 MWK" becomes 15000)
-For dates, use YYYY-MM-DD format (today is 2025-08-04)
+For dates, use YYYY-MM-DD format (today's date is given in the last system message)
 For task status, use: "To Do", "In Progress", "Done"
 For issue severity, use: "Low", "Medium", "High"
 For issue category, use: "Equipment", "Supply", "Complaint", "Other"
 For issue status, use: "Open", "Resolved" (NOT "To Do" - that's only for tasks)
 
 IMPORTANT: 
-- Always include the date field with today's date (2025-08-04) if not specified
-- Convert relative dates like "Friday" to actual dates (e.g., "Friday" becomes "2025-08-08")
+- Always include the date field with today's date if not specified
+- Convert relative dates like "Friday" to actual dates (e.g., on Monday 2025-08-04, "Friday" becomes "2025-08-08")
 - Auto-detect severity from keywords: "urgent", "critical", "emergency" = "High"; "important", "priority" = "Medium"; default = "Low"
 - For tasks, if no assignment mentioned, default to "Nthambi"
 - For issues, if no reporter mentioned, default to "Nthambi"
@@ -90,333 +212,624 @@ Example output:
   "assigned_to": "Nthambi"
 }
 
-Only include fields that are present or can be reasonably inferred."""
+Only fill in fields that are present or can be reasonably inferred; set the rest to null."""
+
+# Extra instructions when several messages are parsed in one call
+_MULTIPLE_INSTRUCTIONS = """The user message is a JSON object {"entries": [...]} holding several separate messages.
+Parse each one independently and respond with {"entries": [...]} containing exactly one
+output object per input message, in the same order."""
+
+# Example messages for few-shot learning
+_EXAMPLE_MESSAGES = (
+    {
+        "role": "user",
+        "content": "Paid 15,000 MWK for filter replacement from petty cash."
+    },
+    {
+        "role": "assistant",
+        "content": json.dumps({
+            "type": "expense",
+            "date": "2025-08-04",
+            "amount": 15000,
+            "description": "Filter replacement",
+            "person": "Me"
+        })
+    },
+    {
+        "role": "user",
+        "content": "Spent 25,000 on generator fuel, receipt attached"
+    },
+    {
+        "role": "assistant",
+        "content": json.dumps({
+            "type": "expense",
+            "date": "2025-08-04",
+            "amount": 25000,
+            "description": "Generator fuel",
+            "person": "Me",
+            "receipt_url": "attached"
+        })
+    },
+    {
+        "role": "user",
+        "content": "Gave 40 liters diesel to Hilux, driver John, for Salima trip. Odometer start 12300 end 12420."
+    },
+    {
+        "role": "assistant",
+        "content": json.dumps({
+            "type": "fuel",
+            "date": "2025-08-04",
+            "vehicle": "Toyota Hilux",
+            "driver": "John",
+            "liters": 40,
+            "odometer_start": 12300,
+            "odometer_end": 12420,
+            "purpose": "Salima trip"
+        })
+    },
+    {
+        "role": "user",
+        "content": "Prado refueled 35L, driver Sarah, odometer 15600 to 15800, maintenance visit"
+    },
+    {
+        "role": "assistant",
+        "content": json.dumps({
+            "type": "fuel",
+            "date": "2025-08-04",
+            "vehicle": "Toyota Prado",
+            "driver": "Sarah",
+            "liters": 35,
+            "odometer_start": 15600,
+            "odometer_end": 15800,
+            "purpose": "Maintenance visit"
+        })
+    },
+    {
+        "role": "user",
+        "content": "Assign John to safety inspection by Friday"
+    },
+    {
+        "role": "assistant",
+        "content": json.dumps({
+            "type": "task",
+            "task_title": "Safety inspection",
+            "details": "Assign John to safety inspection",
+            "status": "To Do",
+            "deadline": "2025-08-08",
+            "assigned_to": "John"
+        })
+    },
+    {
+        "role": "user",
+        "content": "Urgent: Air compressor malfunctioning"
+    },
+    {
+        "role": "assistant",
+        "content": json.dumps({
+            "type": "issue",
+            "category": "Equipment",
+            "description": "Air compressor malfunctioning",
+            "severity": "High",
+            "status": "Open",
+            "reported_by": "Nthambi"
+        })
+    },
+    {
+        "role": "user",
+        "content": "Need to prepare client presentation by next week"
+    },
+    {
+        "role": "assistant",
+        "content": json.dumps({
+            "type": "task",
+            "task_title": "Prepare client presentation",
+            "details": "Prepare client presentation",
+            "status": "To Do",
+            "deadline": "2025-08-11",
+            "assigned_to": "Nthambi"
+        })
+    },
+    {
+        "role": "user",
+        "content": "Fuel supply running low"
+    },
+    {
+        "role": "assistant",
+        "content": json.dumps({
+            "type": "issue",
+            "category": "Supply",
+            "description": "Fuel supply running low",
+            "severity": "Medium",
+            "status": "Open",
+            "reported_by": "Nthambi"
+        })
+    }
+)
+
+# Day the few-shot examples were written on, so their dates stay consistent
+_EXAMPLE_DATE = date(2025, 8, 4)
+
+# System prompt with the few-shot examples folded in. It is sent first and unchanged
+# on every call, so OpenAI's automatic prompt-prefix caching can reuse it; today's
+# date goes in a short message after it.
+_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": _SYSTEM_PROMPT + f"\n\nExamples (written on {_EXAMPLE_DATE:%A} {_EXAMPLE_DATE.isoformat()}):\n\n" + "\n\n".join(
+        f"User: {user['content']}\nAssistant: {assistant['content']}"
+        for user, assistant in zip(_EXAMPLE_MESSAGES[::2], _EXAMPLE_MESSAGES[1::2])
+    )
+}
+# A fine-tuned model has learned the examples, so it only needs the instructions
+_FINE_TUNED_SYSTEM_MESSAGE = {"role": "system", "content": _SYSTEM_PROMPT}
+_MULTIPLE_MESSAGE = {"role": "system", "content": _MULTIPLE_INSTRUCTIONS}
+
+def _date_message(day: date) -> Dict[str, str]:
+    """The system message telling GPT which day it is."""
+    return {"role": "system", "content": f"Today is {day:%A} {day.isoformat()}."}
+
+# Chat model used for parsing; set OPENAI_PARSER_MODEL to use a fine-tuned "ft:..." model
+DEFAULT_MODEL = "gpt-4o-mini"
+
+class GPTParser:
+    """Handles GPT-based message parsing."""
     
-    def get_example_messages(self) -> list:
+    def __init__(self, api_key: str, max_concurrent_requests: int = 5, model: Optional[str] = None):
+        self.api_key = api_key
+        self.model = model or os.getenv("OPENAI_PARSER_MODEL") or DEFAULT_MODEL
+        # Caps in-flight chat completions so parallel parsing stays under the OpenAI rate limit
+        self._request_slots = asyncio.Semaphore(max_concurrent_requests)
+        # Initialize OpenAI client
+        self.client = openai.AsyncOpenAI(api_key=api_key)
+        # Identical messages share one parse (including one still in flight) for five minutes
+        self._parse_cache: TTLCache = TTLCache(maxsize=512, ttl=300)
+    
+    def get_system_prompt(self, multiple: bool = False) -> str:
+        """Get the system prompt for GPT."""
+        return _SYSTEM_PROMPT + "\n\n" + _MULTIPLE_INSTRUCTIONS if multiple else _SYSTEM_PROMPT
+    
+    def get_example_messages(self) -> tuple:
         """Get example messages for few-shot learning."""
-        return [
-            {
-                "role": "user",
-                "content": "Paid 15,000 MWK for filter replacement from petty cash."
-            },
-            {
-                "role": "assistant",
-                "content": json.dumps({
-                    "type": "expense",
-                    "date": "2025-08-04",
-                    "amount": 15000,
-                    "description": "Filter replacement",
-                    "person": "Me"
-                })
-            },
-            {
-                "role": "user",
-                "content": "Spent 25,000 on generator fuel, receipt attached"
-            },
-            {
-                "role": "assistant",
-                "content": json.dumps({
-                    "type": "expense",
-                    "date": "2025-08-04",
-                    "amount": 25000,
-                    "description": "Generator fuel",
-                    "person": "Me",
-                    "receipt_url": "attached"
-                })
-            },
-            {
-                "role": "user",
-                "content": "Gave 40 liters diesel to Hilux, driver John, for Salima trip. Odometer start 12300 end 12420."
-            },
-            {
-                "role": "assistant",
-                "content": json.dumps({
-                    "type": "fuel",
-                    "date": "2025-08-04",
-                    "vehicle": "Toyota Hilux",
-                    "driver": "John",
-                    "liters": 40,
-                    "odometer_start": 12300,
-                    "odometer_end": 12420,
-                    "purpose": "Salima trip"
-                })
-            },
-            {
-                "role": "user",
-                "content": "Prado refueled 35L, driver Sarah, odometer 15600 to 15800, maintenance visit"
-            },
-            {
-                "role": "assistant",
-                "content": json.dumps({
-                    "type": "fuel",
-                    "date": "2025-08-04",
-                    "vehicle": "Toyota Prado",
-                    "driver": "Sarah",
-                    "liters": 35,
-                    "odometer_start": 15600,
-                    "odometer_end": 15800,
-                    "purpose": "Maintenance visit"
-                })
-            },
-            {
-                "role": "user",
-                "content": "Assign John to safety inspection by Friday"
-            },
-            {
-                "role": "assistant",
-                "content": json.dumps({
-                    "type": "task",
-                    "task_title": "Safety inspection",
-                    "details": "Assign John to safety inspection",
-                    "status": "To Do",
-                    "deadline": "2025-08-08",
-                    "assigned_to": "John"
-                })
-            },
-            {
-                "role": "user",
-                "content": "Urgent: Air compressor malfunctioning"
-            },
-            {
-                "role": "assistant",
-                "content": json.dumps({
-                    "type": "issue",
-                    "category": "Equipment",
-                    "description": "Air compressor malfunctioning",
-                    "severity": "High",
-                    "status": "Open",
-                    "reported_by": "Nthambi"
-                })
-            },
-            {
-                "role": "user",
-                "content": "Need to prepare client presentation by next week"
-            },
-            {
-                "role": "assistant",
-                "content": json.dumps({
-                    "type": "task",
-                    "task_title": "Prepare client presentation",
-                    "details": "Prepare client presentation",
-                    "status": "To Do",
-                    "deadline": "2025-08-11",
-                    "assigned_to": "Nthambi"
-                })
-            },
-            {
-                "role": "user",
-                "content": "Fuel supply running low"
-            },
-            {
-                "role": "assistant",
-                "content": json.dumps({
-                    "type": "issue",
-                    "category": "Supply",
-                    "description": "Fuel supply running low",
-                    "severity": "Medium",
-                    "status": "Open",
-                    "reported_by": "Nthambi"
-                })
-            }
-        ]
+        return _EXAMPLE_MESSAGES
     
-    async def parse_message(self, message: str) -> Optional[ParsedEntry]:
-        """Parse a natural language message into structured data."""
-        try:
-            # Check if message contains multiple entries separated by semicolons
-            if ';' in message:
-                # This is a multi-entry message, but we'll handle it in the calling code
-                # For now, just parse the first entry to maintain backward compatibility
-                first_entry = message.split(';')[0].strip()
-                return await self._parse_single_message(first_entry)
-            else:
-                return await self._parse_single_message(message)
-            
-        except Exception as e:
-            logger.error(f"Error parsing message: {e}")
-            return None
+    def get_fine_tuning_jsonl(self) -> str:
+        """Few-shot examples as chat fine-tuning data (JSONL), for training a model that needs no examples."""
+        return "\n".join(
+            json.dumps({"messages": [_FINE_TUNED_SYSTEM_MESSAGE, _date_message(_EXAMPLE_DATE), user, assistant]})
+            for user, assistant in zip(_EXAMPLE_MESSAGES[::2], _EXAMPLE_MESSAGES[1::2])
+        )
+    
+    def _messages(self, user_content: str, multiple: bool = False) -> list:
+        """Chat messages for a request; everything before today's date is identical on every call."""
+        system_message = _FINE_TUNED_SYSTEM_MESSAGE if self.model.startswith("ft:") else _SYSTEM_MESSAGE
+        date_message = _date_message(date.today())
+        if multiple:
+            return [system_message, _MULTIPLE_MESSAGE, date_message, {"role": "user", "content": user_content}]
+        return [system_message, date_message, {"role": "user", "content": user_content}]
+    
+    async def parse_message(self, message: str, on_type: Optional[Callable[[EntryType], Any]] = None) -> Optional[ParsedEntry]:
+        """Parse a natural language message into structured data.
+        
+        on_type, if given, is called (or awaited) with GPT's classification as soon
+        as it streams in, before the rest of the response; the final entry may still
+        be reclassified.
+        """
+        # Multi-entry messages are handled by parse_multiple_entries; only the first entry
+        # is parsed here for backward compatibility. _parse_single_message logs and
+        # returns None on any error.
+        if ';' in message:
+            message = message.split(';', 1)[0].strip()
+        return await self._parse_single_message(message, on_type)
     
     async def parse_multiple_entries(self, message: str) -> list[ParsedEntry]:
         """Parse a message containing multiple entries separated by semicolons."""
+        # Split message by semicolons and clean up whitespace
+        return await self.parse_entries(split_entries(message))
+    
+    async def parse_entries(self, entries: list[str]) -> list[ParsedEntry]:
+        """Parse entries already split from a message, skipping any that fail."""
         try:
-            # Split message by semicolons and clean up whitespace
-            entries = [entry.strip() for entry in message.split(';') if entry.strip()]
+            if not entries:
+                return []
             
             if len(entries) == 1:
                 # Single entry, use regular parsing
                 single_entry = await self._parse_single_message(entries[0])
                 return [single_entry] if single_entry else []
             
-            # Parse each entry individually
-            parsed_entries = []
-            for i, entry_text in enumerate(entries):
-                logger.info(f"Parsing entry {i+1}/{len(entries)}: {entry_text}")
-                
-                parsed_entry = await self._parse_single_message(entry_text)
-                if parsed_entry:
-                    parsed_entries.append(parsed_entry)
-                else:
+            # Simple entries are parsed locally; the rest go to GPT in one call
+            results = [self._try_local_parse(entry_text) for entry_text in entries]
+            remaining = [i for i, result in enumerate(results) if result is None]
+            
+            if remaining:
+                # Repeated entries are only sent to GPT once
+                unique = list(dict.fromkeys(entries[i] for i in remaining))
+                batch = await self._parse_entries_batch(unique)
+                if batch is None:
+                    # Fall back to parsing each entry individually, all at once
+                    batch = await asyncio.gather(
+                        *(self._parse_single_message(entry_text) for entry_text in unique),
+                        return_exceptions=True
+                    )
+                parsed = dict(zip(unique, batch))
+                for i in remaining:
+                    results[i] = parsed[entries[i]]
+            
+            for i, (entry_text, result) in enumerate(zip(entries, results)):
+                if not isinstance(result, ParsedEntry):
                     logger.warning(f"Failed to parse entry {i+1}: {entry_text}")
             
-            return parsed_entries
+            return [result for result in results if isinstance(result, ParsedEntry)]
             
         except Exception as e:
             logger.error(f"Error parsing multiple entries: {e}")
             return []
     
-    async def _parse_single_message(self, message: str) -> Optional[ParsedEntry]:
-        """Parse a single natural language message into structured data."""
+    async def _parse_entries_batch(self, entries: list[str]) -> Optional[list[Optional[ParsedEntry]]]:
+        """Parse several messages with a single GPT call; None if the batch response is unusable.
+        
+        Results line up with entries, with None for any entry that failed to parse.
+        """
         try:
-            # Use asyncio.to_thread for the synchronous OpenAI call
-            import asyncio
-            
-            def make_openai_call():
-                return self.client.chat.completions.create(
-                    model="gpt-4o-mini",
-                    messages=[
-                        {"role": "system", "content": self.get_system_prompt()},
-                        *self.get_example_messages(),
-                        {"role": "user", "content": message}
-                    ],
+            async with self._request_slots:
+                response = await self.client.chat.completions.create(
+                    model=self.model,
+                    messages=self._messages(json.dumps({"entries": entries}), multiple=True),
+                    response_format=_ENTRIES_RESPONSE_FORMAT,
                     temperature=0.1
                 )
             
-            response = await asyncio.to_thread(make_openai_call)
-            
             content = response.choices[0].message.content
-            logger.info(f"GPT response: {content}")
-            parsed_data = json.loads(content)
-            logger.info(f"Parsed data: {parsed_data}")
+            logger.info(f"GPT batch response: {content}")
+            results = json.loads(content)["entries"]
+            if len(results) != len(entries):
+                logger.warning(f"GPT returned {len(results)} results for {len(entries)} entries")
+                return None
             
-            # Convert to ParsedEntry
-            entry_type = EntryType(parsed_data["type"])
-            # Remove 'type' from parsed_data to avoid conflict
-            parsed_data_copy = parsed_data.copy()
-            del parsed_data_copy["type"]
-            logger.info(f"Data after removing type: {parsed_data_copy}")
+            parsed_entries = []
+            for i, (entry_text, parsed_data) in enumerate(zip(entries, results)):
+                try:
+                    parsed_entries.append(self._build_entry(_ENTRY_ADAPTER.validate_python(parsed_data), entry_text))
+                except Exception as e:
+                    logger.warning(f"Failed to parse entry {i+1}: {entry_text} ({e})")
+                    parsed_entries.append(None)
             
-            # Set default date if missing
-            if "date" not in parsed_data_copy or not parsed_data_copy["date"]:
-                from datetime import datetime
-                parsed_data_copy["date"] = datetime.now().strftime("%Y-%m-%d")
+            return parsed_entries
             
-            # Validate classification and fix if needed
-            if entry_type == EntryType.FUEL:
-                # Check if it should actually be an issue (e.g., "fuel supply running low")
-                if self.is_issue_message(message) and not any(word in message.lower() for word in ["liters", "used", "gave", "refueled"]):
-                    entry_type = EntryType.ISSUE
-                    # Try to extract issue info
-                    if "urgent" in message.lower() or "critical" in message.lower() or "emergency" in message.lower():
-                        parsed_data_copy["severity"] = "High"
-                    elif "important" in message.lower() or "priority" in message.lower():
-                        parsed_data_copy["severity"] = "Medium"
-                    else:
-                        parsed_data_copy["severity"] = "Low"
-                    
-                    # Determine category
-                    if any(word in message.lower() for word in ["equipment", "machine", "compressor", "generator"]):
-                        parsed_data_copy["category"] = "Equipment"
-                    elif any(word in message.lower() for word in ["fuel", "supply", "material"]):
-                        parsed_data_copy["category"] = "Supply"
-                    elif any(word in message.lower() for word in ["complaint", "customer", "service"]):
-                        parsed_data_copy["category"] = "Complaint"
-                    else:
-                        parsed_data_copy["category"] = "Other"
+        except Exception as e:
+            logger.error(f"Error parsing entries in one batch: {e}")
+            return None
+    
+    async def parse_batch_async(
+        self,
+        messages: list[str],
+        poll_interval: float = 5.0,
+        max_poll_interval: float = 300.0
+    ) -> list[ParsedEntry]:
+        """Parse many messages through the OpenAI Batch API.
+        
+        Meant for non-interactive bulk imports: batch requests cost half as much
+        but may take up to 24 hours to complete.
+        """
+        try:
+            results: list[Optional[ParsedEntry]] = [self._try_local_parse(message) for message in messages]
+            remaining = [i for i, result in enumerate(results) if result is None]
             
-            elif entry_type == EntryType.ISSUE:
-                # Check if it should actually be fuel, expense, or task
-                if self.is_fuel_message(message) and any(word in message.lower() for word in ["liters", "used", "gave", "refueled"]):
-                    entry_type = EntryType.FUEL
-                    # Try to extract fuel info
-                    if "hilux" in message.lower():
-                        parsed_data_copy["vehicle"] = "Toyota Hilux"
-                    elif "prado" in message.lower():
-                        parsed_data_copy["vehicle"] = "Toyota Prado"
-                    else:
-                        parsed_data_copy["vehicle"] = "Other"
-                    
-                    # Extract liters if present
-                    import re
-                    liters_match = re.search(r'(\d+)\s*liters?', message.lower())
-                    if liters_match:
-                        parsed_data_copy["liters"] = float(liters_match.group(1))
-                
-                elif self.is_expense_message(message):
-                    entry_type = EntryType.EXPENSE
+            if remaining:
+                lines = "\n".join(
+                    json.dumps({
+                        "custom_id": str(i),
+                        "method": "POST",
+                        "url": "/v1/chat/completions",
+                        "body": self._chat_request(messages[i])
+                    })
+                    for i in remaining
+                )
+                batch_file = await self.client.files.create(
+                    file=("parse_batch.jsonl", lines.encode()), purpose="batch"
+                )
+                batch = await self.client.batches.create(
+                    input_file_id=batch_file.id,
+                    endpoint="/v1/chat/completions",
+                    completion_window="24h"
+                )
+                logger.info(f"Submitted parse batch {batch.id} with {len(remaining)} messages")
                 
-                elif self.is_task_message(message):
-                    entry_type = EntryType.TASK
-                    # Try to extract task info
-                    if "assign" in message.lower():
-                        # Extract assignment
-                        import re
-                        assign_match = re.search(r'assign\s+(\w+)', message.lower())
-                        if assign_match:
-                            parsed_data_copy["assigned_to"] = assign_match.group(1).title()
-                        else:
-                            parsed_data_copy["assigned_to"] = "Nthambi"
-                    
-                    # Extract deadline
-                    if "friday" in message.lower():
-                        parsed_data_copy["deadline"] = "2025-08-08"
-                    elif "next week" in message.lower():
-                        parsed_data_copy["deadline"] = "2025-08-11"
-                    elif "monday" in message.lower():
-                        parsed_data_copy["deadline"] = "2025-08-11"
-                    elif "tuesday" in message.lower():
-                        parsed_data_copy["deadline"] = "2025-08-12"
-                    elif "wednesday" in message.lower():
-                        parsed_data_copy["deadline"] = "2025-08-13"
-                    elif "thursday" in message.lower():
-                        parsed_data_copy["deadline"] = "2025-08-14"
-                    elif "saturday" in message.lower():
-                        parsed_data_copy["deadline"] = "2025-08-09"
-                    elif "sunday" in message.lower():
-                        parsed_data_copy["deadline"] = "2025-08-10"
+                # Poll with exponential backoff until the batch finishes
+                delay = poll_interval
+                while batch.status not in ("completed", "failed", "expired", "cancelled"):
+                    await asyncio.sleep(delay)
+                    delay = min(delay * 2, max_poll_interval)
+                    batch = await self.client.batches.retrieve(batch.id)
                 
-                # If it's still an issue but missing description, try to extract from task_title or create one
-                if entry_type == EntryType.ISSUE and not parsed_data_copy.get("description"):
-                    if parsed_data_copy.get("task_title"):
-                        parsed_data_copy["description"] = parsed_data_copy["task_title"]
-                        del parsed_data_copy["task_title"]
-                    else:
-                        # Create a basic description from the message
-                        parsed_data_copy["description"] = message.strip()
+                if batch.status != "completed" or not batch.output_file_id:
+                    logger.error(f"Parse batch {batch.id} ended with status {batch.status}")
+                else:
+                    output = await self.client.files.content(batch.output_file_id)
+                    for line in output.text.splitlines():
+                        if line.strip():
+                            self._read_batch_result(json.loads(line), messages, results)
+            
+            for i, (message, result) in enumerate(zip(messages, results)):
+                if result is None:
+                    logger.warning(f"Failed to parse batch message {i+1}: {message}")
+            
+            return [result for result in results if result is not None]
+            
+        except Exception as e:
+            logger.error(f"Error parsing messages with the Batch API: {e}")
+            return []
+    
+    def _read_batch_result(self, line: Dict[str, Any], messages: list[str], results: list):
+        """Store the ParsedEntry from one Batch API output line into results."""
+        try:
+            index = int(line["custom_id"])
+            response = line.get("response") or {}
+            if response.get("status_code") != 200:
+                logger.warning(f"Batch request {index} failed: {line.get('error') or response}")
+                return
+            
+            content = response["body"]["choices"][0]["message"]["content"]
+            results[index] = self._build_entry(_ENTRY_ADAPTER.validate_json(content), messages[index])
+            
+        except Exception as e:
+            logger.warning(f"Error reading batch result: {e}")
+    
+    def _chat_request(self, message: str) -> Dict[str, Any]:
+        """Chat completion parameters for parsing a single message."""
+        return {
+            "model": self.model,
+            "messages": self._messages(message),
+            "response_format": _ENTRY_RESPONSE_FORMAT,
+            "temperature": 0.1
+        }
+    
+    async def _parse_single_message(self, message: str, on_type: Optional[Callable[[EntryType], Any]] = None) -> Optional[ParsedEntry]:
+        """Parse a single natural language message into structured data.
+        
+        Identical messages on the same day reuse the first parse; on_type only fires for
+        the call that actually runs it.
+        """
+        # Today's date is part of the key so relative dates never carry over midnight
+        key = (date.today().isoformat(), message.strip())
+        task = self._parse_cache.get(key)
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.ensure_future(self._parse_uncached(message, on_type))
+            self._parse_cache[key] = task
+        
+        # Shielded so one caller being cancelled doesn't cancel the parse for the others
+        entry = await asyncio.shield(task)
+        if entry is None:
+            # Don't hold on to failures; the next attempt should retry
+            self._parse_cache.pop(key, None)
+        return entry
+    
+    async def _parse_uncached(self, message: str, on_type: Optional[Callable[[EntryType], Any]] = None) -> Optional[ParsedEntry]:
+        """Parse a single message: local fast path, then GPT."""
+        try:
+            entry = self._try_local_parse(message)
+            if entry is not None:
+                return entry
             
-            elif entry_type == EntryType.TASK:
-                # Check if it should actually be an issue
-                if self.is_issue_message(message):
-                    entry_type = EntryType.ISSUE
-                    # Try to extract issue info
-                    if "urgent" in message.lower() or "critical" in message.lower() or "emergency" in message.lower():
-                        parsed_data_copy["severity"] = "High"
-                    elif "important" in message.lower() or "priority" in message.lower():
-                        parsed_data_copy["severity"] = "Medium"
-                    else:
-                        parsed_data_copy["severity"] = "Low"
-                    
-                    # Determine category
-                    if any(word in message.lower() for word in ["equipment", "machine", "compressor", "generator"]):
-                        parsed_data_copy["category"] = "Equipment"
-                    elif any(word in message.lower() for word in ["fuel", "supply", "material"]):
-                        parsed_data_copy["category"] = "Other"
-                    elif any(word in message.lower() for word in ["complaint", "customer", "service"]):
-                        parsed_data_copy["category"] = "Complaint"
-                    else:
-                        parsed_data_copy["category"] = "Other"
+            async with self._request_slots:
+                content = await self._stream_completion(message, on_type)
             
-            entry = ParsedEntry(type=entry_type, **parsed_data_copy)
+            logger.info(f"GPT response: {content}")
+            # Parse and validate the JSON in a single pass
+            entry = self._build_entry(_ENTRY_ADAPTER.validate_json(content), message)
             
             logger.info(f"Successfully parsed message: {entry}")
             return entry
             
-        except json.JSONDecodeError as e:
-            logger.error(f"Failed to parse GPT response as JSON: {e}")
+        except ValidationError as e:
+            logger.error(f"Failed to parse GPT response as a valid entry: {e}")
             return None
         except Exception as e:
             logger.error(f"Error parsing message: {e}")
             return None
     
+    async def _stream_completion(self, message: str, on_type: Optional[Callable[[EntryType], Any]]) -> str:
+        """Stream the chat completion for a message, reporting its type as soon as it is known."""
+        stream = await self.client.chat.completions.create(**self._chat_request(message), stream=True)
+        parts = []
+        reported = on_type is None
+        
+        async for chunk in stream:
+            if not chunk.choices or not chunk.choices[0].delta.content:
+                continue
+            parts.append(chunk.choices[0].delta.content)
+            
+            if not reported:
+                # Partial parsing only yields "type" once its string value is complete
+                seen = "".join(parts)
+                partial = from_json(seen, allow_partial=True) if '"type"' in seen else None
+                if isinstance(partial, dict) and "type" in partial:
+                    reported = True
+                    try:
+                        result = on_type(EntryType(partial["type"]))
+                        if asyncio.iscoroutine(result):
+                            await result
+                    except Exception as e:
+                        logger.warning(f"Early type callback failed: {e}")
+        
+        return "".join(parts)
+    
+    def _build_entry(self, entry: ParsedEntry, message: str) -> ParsedEntry:
+        """Fill defaults and fix the classification of one validated GPT entry."""
+        updates = self._postprocess(entry, message)
+        
+        # Set default date if missing
+        if not entry.date:
+            updates["date"] = date.today().isoformat()
+        
+        return replace(entry, **updates) if updates else entry
+    
+    def _postprocess(self, entry: ParsedEntry, message: str) -> Dict[str, Any]:
+        """Fix up GPT's classification using keyword heuristics; returns the field updates."""
+        updates: Dict[str, Any] = {}
+        reclassify = self._RECLASSIFIERS.get(entry.type)
+        entry_type = entry.type
+        if reclassify:
+            entry_type = reclassify(self, entry, message, message.lower(), _classify(message), updates)
+        
+        if entry_type != entry.type:
+            updates["type"] = entry_type
+        return updates
+    
+    def _reclassify_fuel(self, entry: ParsedEntry, message: str, message_lower: str, kinds: set, updates: Dict[str, Any]) -> EntryType:
+        """Turn a fuel entry into an issue when it reports a problem rather than a refuel."""
+        # Check if it should actually be an issue (e.g., "fuel supply running low")
+        if "issue" in kinds and not _REFUEL_RE.search(message_lower):
+            self._set_issue_fields(message_lower, updates, supply_category="Supply")
+            return EntryType.ISSUE
+        return entry.type
+    
+    def _reclassify_issue(self, entry: ParsedEntry, message: str, message_lower: str, kinds: set, updates: Dict[str, Any]) -> EntryType:
+        """Turn an issue into fuel, expense or task when the keywords say so."""
+        entry_type = entry.type
+        
+        # Check if it should actually be fuel, expense, or task
+        if "fuel" in kinds and _REFUEL_RE.search(message_lower):
+            entry_type = EntryType.FUEL
+            # Try to extract fuel info
+            if "hilux" in message_lower:
+                updates["vehicle"] = "Toyota Hilux"
+            elif "prado" in message_lower:
+                updates["vehicle"] = "Toyota Prado"
+            else:
+                updates["vehicle"] = "Other"
+            
+            # Extract liters if present
+            liters_match = _LITERS_RE.search(message_lower)
+            if liters_match:
+                updates["liters"] = float(liters_match.group(1))
+        
+        elif "expense" in kinds:
+            entry_type = EntryType.EXPENSE
+        
+        elif "task" in kinds:
+            entry_type = EntryType.TASK
+            # Try to extract task info
+            if "assign" in message_lower:
+                # Extract assignment
+                assign_match = _ASSIGN_RE.search(message_lower)
+                if assign_match:
+                    updates["assigned_to"] = assign_match.group(1).title()
+                else:
+                    updates["assigned_to"] = "Nthambi"
+            
+            # Extract deadline
+            deadline = self._deadline_for(message_lower)
+            if deadline:
+                updates["deadline"] = deadline
+        
+        # If it's still an issue but missing description, try to extract from task_title or create one
+        if entry_type == EntryType.ISSUE and not entry.description:
+            if entry.task_title:
+                updates["description"] = entry.task_title
+                updates["task_title"] = None
+            else:
+                # Create a basic description from the message
+                updates["description"] = message.strip()
+        
+        return entry_type
+    
+    def _reclassify_task(self, entry: ParsedEntry, message: str, message_lower: str, kinds: set, updates: Dict[str, Any]) -> EntryType:
+        """Turn a task into an issue when it reports a problem."""
+        # Check if it should actually be an issue
+        if "issue" in kinds:
+            self._set_issue_fields(message_lower, updates, supply_category="Other")
+            return EntryType.ISSUE
+        return entry.type
+    
+    # Reclassification step for each type GPT may have got wrong
+    _RECLASSIFIERS = {
+        EntryType.FUEL: _reclassify_fuel,
+        EntryType.ISSUE: _reclassify_issue,
+        EntryType.TASK: _reclassify_task,
+    }
+    
+    def _set_issue_fields(self, message_lower: str, updates: Dict[str, Any], supply_category: str):
+        """Infer severity and category for an entry reclassified as an issue."""
+        # Try to extract issue info
+        if _SEV_HIGH_RE.search(message_lower):
+            updates["severity"] = "High"
+        elif _SEV_MEDIUM_RE.search(message_lower):
+            updates["severity"] = "Medium"
+        else:
+            updates["severity"] = "Low"
+        
+        # Determine category
+        if _CATEGORY_EQUIPMENT_RE.search(message_lower):
+            updates["category"] = "Equipment"
+        elif _CATEGORY_SUPPLY_RE.search(message_lower):
+            updates["category"] = supply_category
+        elif _CATEGORY_COMPLAINT_RE.search(message_lower):
+            updates["category"] = "Complaint"
+        else:
+            updates["category"] = "Other"
+    
+    def _deadline_for(self, message_lower: str) -> Optional[str]:
+        """Deadline date for a weekday or "next week" mentioned in the message."""
+        for phrase, weekday in _DEADLINE_WEEKDAYS.items():
+            if phrase in message_lower:
+                return _next_weekday(weekday).isoformat()
+        return None
+    
+    def _try_local_parse(self, message: str) -> Optional[ParsedEntry]:
+        """Parse simple, templated messages without GPT; None if GPT is needed."""
+        message = message.strip()
+        message_lower = message.lower()
+        kinds = _classify(message)
+        # Only take messages that clearly belong to a single type
+        if len(kinds) != 1:
+            return None
+        
+        entry = None
+        if "fuel" in kinds:
+            liters = _LOCAL_LITERS_RE.search(message_lower)
+            driver = _LOCAL_DRIVER_RE.search(message)
+            vehicle = next((name for key, name in _LOCAL_VEHICLES.items() if key in message_lower), None)
+            purpose = _LOCAL_PURPOSE_RE.search(message)
+            if liters and driver and vehicle and purpose:
+                odometer = _LOCAL_ODOMETER_RE.search(message_lower)
+                entry = ParsedEntry(
+                    type=EntryType.FUEL,
+                    vehicle=vehicle,
+                    driver=driver.group(1).title(),
+                    liters=float(liters.group(1)),
+                    odometer_start=int(odometer.group(1)) if odometer else None,
+                    odometer_end=int(odometer.group(2)) if odometer else None,
+                    purpose=purpose.group(1).strip().capitalize(),
+                )
+        
+        elif "expense" in kinds:
+            match = _LOCAL_EXPENSE_RE.match(message)
+            if match and "receipt" not in message_lower:
+                entry = ParsedEntry(
+                    type=EntryType.EXPENSE,
+                    amount=float(match.group(1).replace(',', '')),
+                    description=match.group(2).strip().capitalize(),
+                    person="Me",
+                )
+        
+        elif "task" in kinds:
+            match = _LOCAL_ASSIGN_RE.match(message)
+            if match:
+                entry = ParsedEntry(
+                    type=EntryType.TASK,
+                    task_title=match.group(2).strip().capitalize(),
+                    details=message.rstrip('.'),
+                    status="To Do",
+                    deadline=self._deadline_for(message_lower) if match.group(3) else None,
+                    assigned_to=match.group(1).title(),
+                )
+        
+        if entry is None or not self.validate_parsed_entry(entry):
+            return None
+        
+        logger.info(f"Parsed message locally: {entry}")
+        return replace(entry, date=date.today().isoformat())
+    
     def validate_parsed_entry(self, entry: ParsedEntry) -> bool:
         """Validate that a parsed entry has required fields."""
         if entry.type == EntryType.EXPENSE:
@@ -432,27 +845,19 @@ Only include fields that are present or can be reasonably inferred."""
     
     def is_fuel_message(self, message: str) -> bool:
         """Check if a message is likely about fuel."""
-        fuel_keywords = ['liters', 'fuel', 'diesel', 'petrol', 'gas', 'hilux', 'prado', 'vehicle', 'car']
-        message_lower = message.lower()
-        return any(keyword in message_lower for keyword in fuel_keywords)
+        return "fuel" in _classify(message)
     
     def is_expense_message(self, message: str) -> bool:
         """Check if a message is likely about expenses."""
-        expense_keywords = ['spent', 'paid', 'cost', 'mwk', 'money', 'cash', 'expense']
-        message_lower = message.lower()
-        return any(keyword in message_lower for keyword in expense_keywords)
+        return "expense" in _classify(message)
     
     def is_task_message(self, message: str) -> bool:
         """Check if a message is likely about tasks."""
-        task_keywords = ['assign', 'task', 'todo', 'deadline', 'prepare', 'inspect', 'check', 'review', 'complete', 'finish']
-        message_lower = message.lower()
-        return any(keyword in message_lower for keyword in task_keywords)
+        return "task" in _classify(message)
     
     def is_issue_message(self, message: str) -> bool:
         """Check if a message is likely about issues."""
-        issue_keywords = ['problem', 'issue', 'broken', 'malfunction', 'urgent', 'critical', 'emergency', 'complaint', 'fault']
-        message_lower = message.lower()
-        return any(keyword in message_lower for keyword in issue_keywords)
+        return "issue" in _classify(message)
     
     def generate_confirmation_message(self, entry: ParsedEntry) -> str:
         """Generate a confirmation message for the user."""
@@ -481,25 +886,9 @@ Only include fields that are present or can be reasonably inferred."""
         confirmation_parts = [f"✅ Successfully logged {len(entries)} entries:"]
         
         for i, (entry, record_id) in enumerate(zip(entries, record_ids), 1):
-            entry_type_emoji = {
-                EntryType.EXPENSE: "💰",
-                EntryType.FUEL: "⛽",
-                EntryType.TASK: "📋",
-                EntryType.ISSUE: "⚠️"
-            }.get(entry.type, "📝")
-            
-            if entry.type == EntryType.EXPENSE:
-                summary = f"{entry_type_emoji} {entry.amount:,.0f} MWK - {entry.description}"
-            elif entry.type == EntryType.FUEL:
-                summary = f"{entry_type_emoji} {entry.liters}L - {entry.vehicle}"
-            elif entry.type == EntryType.TASK:
-                summary = f"{entry_type_emoji} {entry.task_title}"
-            elif entry.type == EntryType.ISSUE:
-                description = entry.description or entry.task_title or "No description"
-                summary = f"{entry_type_emoji} {description}"
-            else:
-                summary = f"{entry_type_emoji} {entry.type.value}"
-            
+            emoji = _ENTRY_EMOJI.get(entry.type, "📝")
+            format_summary = _SUMMARY_FMT.get(entry.type)
+            summary = f"{emoji} {format_summary(entry) if format_summary else entry.type.value}"
             confirmation_parts.append(f"{i}. {summary} (ID: {record_id})")
         
         return "\n".join(confirmation_parts)
@@ -5,9 +5,13 @@ Generates daily summaries of operations and sends them via Telegram.
 """
 
 import logging
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime, date
 from dataclasses import dataclass
+from collections import defaultdict
+from collections.abc import Mapping
+from functools import lru_cache
+from operator import itemgetter
 
 # TODO: Import dependencies once created
 # from .airtable_client import client
@@ -15,20 +19,80 @@ from dataclasses import dataclass
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+_get_amount = itemgetter("Amount")
+
+def _sum_field(getter, records: List[Dict[str, Any]]) -> float:
+    """Sum one field over records, skipping records that don't have it."""
+    total = 0
+    for record in records:
+        try:
+            total += getter(record)
+        except KeyError:
+            pass
+    return total
+
+# Message templates, filled with str.format_map
+_HEADER_TEMPLATE = "Daily Summary – {}"
+_PETTY_CASH_TEMPLATE = "• Petty Cash: Spent {petty_cash_spent:,.0f} MWK today. Theoretical balance: {petty_cash_theoretical_balance:,.0f} MWK."
+_QUIET_PETTY_CASH_TEMPLATE = "• Petty Cash: Theoretical balance: {petty_cash_theoretical_balance:,.0f} MWK."
+_ACTUAL_FLOAT_TEMPLATE = " Actual float: {petty_cash_actual_balance:,.0f} MWK. "
+_DIFF_TEMPLATE = "Diff: {petty_cash_diff:+,.0f} MWK."
+_FUEL_TEMPLATE = "{vehicle} ({total_liters}L, {total_kms} km)"
+
+class FrozenRecord(Mapping):
+    """Read-only, hashable view of a record dict."""
+    __slots__ = ("_data", "_hash")
+    
+    def __init__(self, record: Dict[str, Any]):
+        self._data = {key: _freeze(value) for key, value in record.items()}
+        self._hash = None
+    
+    def __getitem__(self, key):
+        return self._data[key]
+    
+    def __iter__(self):
+        return iter(self._data)
+    
+    def __len__(self) -> int:
+        return len(self._data)
+    
+    def __hash__(self) -> int:
+        if self._hash is None:
+            self._hash = hash(frozenset(self._data.items()))
+        return self._hash
+    
+    def __repr__(self) -> str:
+        return f"FrozenRecord({self._data!r})"
+
+def _freeze(value: Any) -> Any:
+    """Convert nested lists and dicts into hashable tuples and FrozenRecords."""
+    if isinstance(value, FrozenRecord):
+        return value
+    if isinstance(value, Mapping):
+        return FrozenRecord(value)
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+@dataclass(frozen=True)
 class DailySummary:
-    """Container for daily summary data."""
+    """Container for daily summary data (immutable and hashable so its formatting can be cached)."""
     date: str
     petty_cash_spent: float
     petty_cash_theoretical_balance: float
     petty_cash_actual_balance: Optional[float]
     petty_cash_diff: Optional[float]
-    fuel_summary: List[Dict[str, Any]]
+    fuel_summary: Tuple[FrozenRecord, ...]
     total_fuel_liters: float
-    pending_tasks: List[Dict[str, Any]]
-    open_issues: List[Dict[str, Any]]
+    pending_tasks: Tuple[FrozenRecord, ...]
+    open_issues: Tuple[FrozenRecord, ...]
     new_issues_count: int
     high_severity_issues: int
+    
+    def __post_init__(self):
+        # Accept plain lists of dicts from callers and store them frozen
+        for name in ("fuel_summary", "pending_tasks", "open_issues"):
+            object.__setattr__(self, name, _freeze(getattr(self, name)))
 
 class SummaryGenerator:
     """Handles daily summary generation and sending."""
@@ -57,21 +121,28 @@ class SummaryGenerator:
             petty_cash_balance = 100000.0
             
             # Calculate summary data
-            petty_cash_spent = sum(expense.get("Amount", 0) for expense in expenses)
+            petty_cash_spent = _sum_field(_get_amount, expenses)
             petty_cash_theoretical_balance = petty_cash_balance - petty_cash_spent
             petty_cash_actual_balance = None  # Would be set manually
             petty_cash_diff = None
             
             # Group fuel by vehicle
             fuel_summary = self._group_fuel_by_vehicle(fuel_logs)
-            total_fuel_liters = sum(log.get("Liters", 0) for log in fuel_logs)
+            # Per-vehicle totals already cover every log
+            total_fuel_liters = sum(vehicle["total_liters"] for vehicle in fuel_summary)
             
-            # Count issues
-            new_issues_count = len([issue for issue in open_issues if issue.get("Date") == target_date.isoformat()])
-            high_severity_issues = len([issue for issue in open_issues if issue.get("Severity") == "High"])
+            # Count issues in one pass
+            target_iso = target_date.isoformat()
+            new_issues_count = 0
+            high_severity_issues = 0
+            for issue in open_issues:
+                if issue.get("Date") == target_iso:
+                    new_issues_count += 1
+                if issue.get("Severity") == "High":
+                    high_severity_issues += 1
             
             return DailySummary(
-                date=target_date.isoformat(),
+                date=target_iso,
                 petty_cash_spent=petty_cash_spent,
                 petty_cash_theoretical_balance=petty_cash_theoretical_balance,
                 petty_cash_actual_balance=petty_cash_actual_balance,
@@ -90,86 +161,32 @@ class SummaryGenerator:
     
     def _group_fuel_by_vehicle(self, fuel_logs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Group fuel logs by vehicle for summary."""
-        vehicle_summary = {}
+        vehicle_summary = defaultdict(lambda: {"vehicle": None, "total_liters": 0, "total_kms": 0, "trips": 0})
         
         for log in fuel_logs:
             vehicle = log.get("Vehicle", "Unknown")
-            liters = log.get("Liters", 0)
-            kms = log.get("KMs Travelled", 0)
-            
-            if vehicle not in vehicle_summary:
-                vehicle_summary[vehicle] = {
-                    "vehicle": vehicle,
-                    "total_liters": 0,
-                    "total_kms": 0,
-                    "trips": 0
-                }
-            
-            vehicle_summary[vehicle]["total_liters"] += liters
-            vehicle_summary[vehicle]["total_kms"] += kms
-            vehicle_summary[vehicle]["trips"] += 1
+            totals = vehicle_summary[vehicle]
+            totals["vehicle"] = vehicle
+            totals["total_liters"] += log.get("Liters", 0)
+            totals["total_kms"] += log.get("KMs Travelled", 0)
+            totals["trips"] += 1
         
         return list(vehicle_summary.values())
     
     def format_summary_message(self, summary: DailySummary) -> str:
         """Format the daily summary as a Telegram message."""
         try:
-            # Format date
-            date_obj = datetime.fromisoformat(summary.date)
-            formatted_date = date_obj.strftime("%b %d, %Y")
-            
-            # Build message
-            message_lines = [f"Daily Summary – {formatted_date}"]
-            
-            # Petty Cash section
-            petty_cash_line = f"• Petty Cash: Spent {summary.petty_cash_spent:,.0f} MWK today. "
-            petty_cash_line += f"Theoretical balance: {summary.petty_cash_theoretical_balance:,.0f} MWK."
-            
-            if summary.petty_cash_actual_balance is not None:
-                petty_cash_line += f" Actual float: {summary.petty_cash_actual_balance:,.0f} MWK. "
-                if summary.petty_cash_diff is not None:
-                    petty_cash_line += f"Diff: {summary.petty_cash_diff:+,.0f} MWK."
-            
-            message_lines.append(petty_cash_line)
-            
-            # Fuel section
-            if summary.total_fuel_liters > 0:
-                fuel_line = f"• Fuel: {summary.total_fuel_liters}L dispensed: "
-                fuel_details = []
-                for vehicle in summary.fuel_summary:
-                    fuel_details.append(f"{vehicle['vehicle']} ({vehicle['total_liters']}L, {vehicle['total_kms']} km)")
-                fuel_line += ", ".join(fuel_details) + "."
-                message_lines.append(fuel_line)
-            else:
-                message_lines.append("• Fuel: No fuel dispensed today.")
-            
-            # Tasks section
-            if summary.pending_tasks:
-                task_titles = [task.get("Task", "Unknown") for task in summary.pending_tasks[:5]]  # Limit to 5
-                task_line = f"• Tasks: {len(summary.pending_tasks)} pending"
-                if task_titles:
-                    task_line += f" ({', '.join(task_titles)})"
-                task_line += "."
-                message_lines.append(task_line)
-            else:
-                message_lines.append("• Tasks: No pending tasks.")
-            
-            # Issues section
-            if summary.open_issues:
-                issue_line = f"• Issues: {summary.new_issues_count} new"
-                if summary.high_severity_issues > 0:
-                    issue_line += f", {summary.high_severity_issues} high severity"
-                issue_line += "."
-                message_lines.append(issue_line)
-            else:
-                message_lines.append("• Issues: No open issues.")
-            
-            return "\n".join(message_lines)
-            
+            return self._format(summary)
         except Exception as e:
             logger.error(f"Error formatting summary message: {e}")
             return "Error generating daily summary."
     
+    @staticmethod
+    @lru_cache(maxsize=32)
+    def _format(summary: DailySummary) -> str:
+        """Build the summary message text; repeated sends of the same summary reuse the result."""
+        return "\n".join(_summary_lines(summary))
+    
     async def send_daily_summary(self, chat_id: int, target_date: Optional[date] = None) -> bool:
         """Generate and send daily summary to specified chat."""
         try:
@@ -205,5 +222,54 @@ class SummaryGenerator:
             logger.error(f"Error sending summary to configured chat: {e}")
             return False
 
+@lru_cache(maxsize=64)
+def _fmt_date(iso: str) -> str:
+    """Format an ISO date for the summary header, e.g. "Oct 15, 2026"."""
+    return datetime.fromisoformat(iso).strftime("%b %d, %Y")
+
+def _petty_cash_line(template: str, summary: DailySummary, fields: Dict[str, Any]) -> str:
+    """Petty cash line from template, plus the actual float and diff once they are set."""
+    line = template.format_map(fields)
+    if summary.petty_cash_actual_balance is not None:
+        line += _ACTUAL_FLOAT_TEMPLATE.format_map(fields)
+        if summary.petty_cash_diff is not None:
+            line += _DIFF_TEMPLATE.format_map(fields)
+    return line
+
+def _summary_lines(summary: DailySummary):
+    """Yield the lines of the daily summary message."""
+    fields = vars(summary)
+    yield _HEADER_TEMPLATE.format(_fmt_date(summary.date))
+    
+    # Quiet days skip the per-section formatting but still report the balance
+    if not (summary.petty_cash_spent or summary.total_fuel_liters or summary.pending_tasks or summary.open_issues):
+        yield "No activity today."
+        yield _petty_cash_line(_QUIET_PETTY_CASH_TEMPLATE, summary, fields)
+        return
+    
+    # Petty Cash section
+    yield _petty_cash_line(_PETTY_CASH_TEMPLATE, summary, fields)
+    
+    # Fuel section
+    if summary.total_fuel_liters > 0:
+        fuel_details = ", ".join(_FUEL_TEMPLATE.format_map(vehicle) for vehicle in summary.fuel_summary)
+        yield f"• Fuel: {summary.total_fuel_liters}L dispensed: {fuel_details}."
+    else:
+        yield "• Fuel: No fuel dispensed today."
+    
+    # Tasks section
+    if summary.pending_tasks:
+        task_titles = ", ".join(task.get("Task", "Unknown") for task in summary.pending_tasks[:5])  # Limit to 5
+        yield f"• Tasks: {len(summary.pending_tasks)} pending ({task_titles})."
+    else:
+        yield "• Tasks: No pending tasks."
+    
+    # Issues section
+    if summary.open_issues:
+        high_severity = f", {summary.high_severity_issues} high severity" if summary.high_severity_issues > 0 else ""
+        yield f"• Issues: {summary.new_issues_count} new{high_severity}."
+    else:
+        yield "• Issues: No open issues."
+
 # Global generator instance
 generator = SummaryGenerator() 
\ No newline at end of file
@@ -6,10 +6,13 @@ and stores results in Airtable.
 """
 
 import os
+import asyncio
 import logging
-from typing import Dict, Any, Optional
+from contextlib import asynccontextmanager
+from typing import Dict, Any, List, Optional
+import httpx
+import msgspec
 from fastapi import FastAPI, Request, HTTPException
-from pydantic import BaseModel
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -17,26 +20,72 @@ load_dotenv('.env')
 
 # Import our modules
 from .airtable_client import AirtableClient
-from .gpt_parser import GPTParser
+from .gpt_parser import GPTParser, split_entries
 from utils.logging_config import setup_logging
+from utils.outbox import Outbox
 
 # Setup logging
 setup_logging()
 logger = logging.getLogger(__name__)
 
-class TelegramUpdate(BaseModel):
+WELCOME_MESSAGE = """
+🤖 **Service Station Operations Bot**
+
+I can help you log:
+• **Petty Cash Expenses** - "Spent 5000 on lunch"
+• **Fuel Logs** - "Hilux used 40 liters"
+• **Tasks** - "Assign John to safety inspection"
+• **Issues** - "Urgent: Air compressor broken"
+
+**NEW: Multiple Entries**
+Separate multiple entries with semicolons (;):
+"Spent 5000 on lunch; Hilux used 40 liters; Assign John to safety inspection"
+
+Just send me a message and I'll process it automatically!
+"""
+
+HELP_MESSAGE = """
+📋 **How to use this bot:**
+
+**Single Entries:**
+Just send a natural message and I'll understand!
+
+**Multiple Entries (NEW!):**
+Separate multiple entries with semicolons (;):
+
+**Examples:**
+• "Spent 5000 on lunch; Paid 20000 for generator fuel"
+• "Hilux used 40 liters; Prado fueled 60 liters"
+• "Assign John to safety inspection; Prepare client presentation"
+• "Spent 5000 on lunch; Hilux used 40 liters; Assign John to safety inspection"
+
+Just type naturally and I'll understand!
+"""
+
+class TelegramUpdate(msgspec.Struct):
     """Telegram webhook update structure."""
     update_id: int
     message: Optional[Dict[str, Any]] = None
     callback_query: Optional[Dict[str, Any]] = None
 
+# JSON parsing and validation happen together in msgspec's decoder
+_UPDATE_DECODER = msgspec.json.Decoder(TelegramUpdate)
+
 class TelegramHandler:
     """Handles Telegram bot interactions."""
     
     def __init__(self):
-        self.app = FastAPI(title="Service Station Ops Bot")
+        self.app = FastAPI(title="Service Station Ops Bot", lifespan=self._lifespan)
         self.airtable_client = None
         self.gpt_parser = None
+        # Pooled HTTP/2 connection to the Bot API, created on first send
+        self.telegram_http: Optional[httpx.AsyncClient] = None
+        # Replies queued per chat and sent together on each flush tick
+        self._outbox = Outbox(self._send_now, flush_interval=0.3)
+        self._commands = {
+            "/start": self._cmd_start,
+            "/help": self._cmd_help,
+        }
         self.setup_routes()
         self.initialize_components()
     
@@ -68,10 +117,32 @@ class TelegramHandler:
     
     def setup_routes(self):
         """Setup FastAPI routes."""
+        # Return annotations double as response models, so FastAPI serializes the
+        # responses straight to JSON bytes in pydantic-core
+        
+        @self.app.get("/")
+        async def root() -> Dict[str, str]:
+            """Service information endpoint."""
+            return {
+                "message": "Service Station Operations Bot API",
+                "status": "running",
+                "version": "1.0.0"
+            }
+        
+        @self.app.get("/telegram-webhook")
+        async def telegram_webhook_check() -> Dict[str, str]:
+            """Respond to GET requests on the webhook endpoint (for testing only)."""
+            return {"status": "ok", "message": "Webhook endpoint is active"}
         
         @self.app.post("/telegram-webhook")
-        async def telegram_webhook(update: TelegramUpdate):
+        async def telegram_webhook(request: Request) -> Dict[str, str]:
             """Handle incoming Telegram webhook updates."""
+            try:
+                update = _UPDATE_DECODER.decode(await request.body())
+            except msgspec.DecodeError as e:
+                # Covers both malformed JSON and updates that don't match TelegramUpdate
+                raise HTTPException(status_code=400, detail=f"Invalid update: {e}")
+            
             try:
                 if update.message:
                     await self.process_message(update.message)
@@ -83,7 +154,7 @@ class TelegramHandler:
                 raise HTTPException(status_code=500, detail=str(e))
         
         @self.app.get("/health")
-        async def health_check():
+        async def health_check() -> Dict[str, Any]:
             """Health check endpoint."""
             return {
                 "status": "healthy",
@@ -92,7 +163,7 @@ class TelegramHandler:
             }
         
         @self.app.post("/daily-summary")
-        async def trigger_daily_summary():
+        async def trigger_daily_summary() -> Dict[str, str]:
             """Manually trigger daily summary generation."""
             # TODO: Implement daily summary generation
             return {"status": "summary_triggered"}
@@ -108,7 +179,7 @@ class TelegramHandler:
                 logger.warning("Invalid message format")
                 return
             
-            logger.info(f"📝 Received message from {chat_id}: {text}")
+            logger.info("📝 Received message from %s: %s", chat_id, text)
             
             # Handle commands
             if text.startswith('/'):
@@ -125,43 +196,19 @@ class TelegramHandler:
     
     async def handle_command(self, chat_id: int, text: str):
         """Handle bot commands."""
-        if text.startswith('/start'):
-            welcome_message = """
-🤖 **Service Station Operations Bot**
-
-I can help you log:
-• **Petty Cash Expenses** - "Spent 5000 on lunch"
-• **Fuel Logs** - "Hilux used 40 liters"
-• **Tasks** - "Assign John to safety inspection"
-• **Issues** - "Urgent: Air compressor broken"
-
-**NEW: Multiple Entries**
-Separate multiple entries with semicolons (;):
-"Spent 5000 on lunch; Hilux used 40 liters; Assign John to safety inspection"
-
-Just send me a message and I'll process it automatically!
-"""
-            await self.send_message(chat_id, welcome_message)
-        
-        elif text.startswith('/help'):
-            help_message = """
-📋 **How to use this bot:**
-
-**Single Entries:**
-Just send a natural message and I'll understand!
-
-**Multiple Entries (NEW!):**
-Separate multiple entries with semicolons (;):
-
-**Examples:**
-• "Spent 5000 on lunch; Paid 20000 for generator fuel"
-• "Hilux used 40 liters; Prado fueled 60 liters"
-• "Assign John to safety inspection; Prepare client presentation"
-• "Spent 5000 on lunch; Hilux used 40 liters; Assign John to safety inspection"
-
-Just type naturally and I'll understand!
-"""
-            await self.send_message(chat_id, help_message)
+        # "/help@BotName args" -> "/help"
+        command = text.split(maxsplit=1)[0].split('@', 1)[0]
+        command_handler = self._commands.get(command)
+        if command_handler:
+            await command_handler(chat_id)
+    
+    async def _cmd_start(self, chat_id: int):
+        """Reply to /start."""
+        await self.send_message(chat_id, WELCOME_MESSAGE)
+    
+    async def _cmd_help(self, chat_id: int):
+        """Reply to /help."""
+        await self.send_message(chat_id, HELP_MESSAGE)
     
     async def process_message_pipeline(self, message: str) -> str:
         """Process a message through the full pipeline."""
@@ -169,11 +216,12 @@ Just type naturally and I'll understand!
             if not self.gpt_parser or not self.airtable_client:
                 return "❌ Bot is not properly initialized. Please try again later."
             
-            # Check if message contains multiple entries separated by semicolons
-            if ';' in message:
-                return await self.process_multiple_entries_pipeline(message)
+            # Split once; several semicolon-separated entries are parsed side by side
+            entries = split_entries(message)
+            if len(entries) > 1:
+                return await self.process_multiple_entries_pipeline(entries)
             else:
-                return await self.process_single_entry_pipeline(message)
+                return await self.process_single_entry_pipeline(entries[0] if entries else message)
             
         except Exception as e:
             logger.error(f"Error processing message: {e}")
@@ -204,26 +252,27 @@ Just type naturally and I'll understand!
             logger.error(f"Error processing single entry: {e}")
             return f"❌ Error: {str(e)}"
     
-    async def process_multiple_entries_pipeline(self, message: str) -> str:
-        """Process multiple entries separated by semicolons."""
+    async def process_multiple_entries_pipeline(self, entries: List[str]) -> str:
+        """Process multiple entries already split from a semicolon-separated message."""
         try:
-            # Step 1: Parse multiple entries with GPT
-            parsed_entries = await self.gpt_parser.parse_multiple_entries(message)
+            # Step 1: Parse the entries (local fast path, then one batched GPT call)
+            parsed_entries = await self.gpt_parser.parse_entries(entries)
             if not parsed_entries:
                 return "❌ Failed to parse any entries. Please check your format and try again."
             
-            # Step 2: Validate and store each entry
-            successful_entries = []
-            record_ids = []
-            
+            # Step 2: Validate each entry
+            valid_entries = []
             for i, entry in enumerate(parsed_entries, 1):
-                # Validate the entry
-                if not self.gpt_parser.validate_parsed_entry(entry):
+                if self.gpt_parser.validate_parsed_entry(entry):
+                    valid_entries.append(entry)
+                else:
                     logger.warning(f"Entry {i} failed validation: {entry}")
-                    continue
-                
-                # Store in Airtable
-                record_id = await self.store_entry_in_airtable(entry)
+            
+            # Step 3: Store all valid entries, batched per table
+            stored_ids = await self.store_entries_in_airtable(valid_entries)
+            successful_entries = []
+            record_ids = []
+            for i, (entry, record_id) in enumerate(zip(valid_entries, stored_ids), 1):
                 if record_id:
                     successful_entries.append(entry)
                     record_ids.append(record_id)
@@ -233,7 +282,7 @@ Just type naturally and I'll understand!
             if not successful_entries:
                 return "❌ No entries were successfully processed. Please check your format and try again."
             
-            # Step 3: Generate confirmation message
+            # Step 4: Generate confirmation message
             return self.gpt_parser.generate_multiple_confirmation_message(successful_entries, record_ids)
             
         except Exception as e:
@@ -243,92 +292,163 @@ Just type naturally and I'll understand!
     async def store_entry_in_airtable(self, parsed_entry) -> Optional[str]:
         """Store a parsed entry in Airtable and return the record ID."""
         try:
-            record_id = None
-            
-            if parsed_entry.type.value == "expense":
-                data = {
-                    "date": parsed_entry.date,
-                    "amount": parsed_entry.amount,
-                    "description": parsed_entry.description,
-                    "person": parsed_entry.person or "Me"
-                }
-                if parsed_entry.receipt_url:
-                    data["receipt_url"] = parsed_entry.receipt_url
-                
-                record_id = await self.airtable_client.create_expense(data)
-                
-            elif parsed_entry.type.value == "fuel":
-                data = {
-                    "date": parsed_entry.date,
-                    "vehicle": parsed_entry.vehicle,
-                    "driver": parsed_entry.driver,
-                    "liters": parsed_entry.liters,
-                    "purpose": parsed_entry.purpose or ""
-                }
-                if parsed_entry.odometer_start:
-                    data["odometer_start"] = parsed_entry.odometer_start
-                if parsed_entry.odometer_end:
-                    data["odometer_end"] = parsed_entry.odometer_end
-                
-                record_id = await self.airtable_client.create_fuel_log(data)
-            
-            elif parsed_entry.type.value == "task":
-                data = {
-                    "date": parsed_entry.date,
-                    "task_title": parsed_entry.task_title,
-                    "details": parsed_entry.details or "",
-                    "status": parsed_entry.status or "To Do",
-                    "assigned_to": parsed_entry.assigned_to or "Nthambi"
-                }
-                if parsed_entry.deadline:
-                    data["deadline"] = parsed_entry.deadline
-                
-                record_id = await self.airtable_client.create_task(data)
-            
-            elif parsed_entry.type.value == "issue":
-                # Use description if available, otherwise use task_title (for misclassified entries)
-                description = parsed_entry.description or parsed_entry.task_title or "No description provided"
-                
-                # Fix status mapping for Issues table (only "Open" or "Resolved" allowed)
-                issue_status = "Open"  # Default for new issues
-                if parsed_entry.status and parsed_entry.status in ["Open", "Resolved"]:
-                    issue_status = parsed_entry.status
-                
-                data = {
-                    "date": parsed_entry.date,
-                    "description": description,
-                    "category": parsed_entry.category or "Other",
-                    "severity": parsed_entry.severity or "Low",
-                    "status": issue_status,
-                    "reported_by": parsed_entry.reported_by or "Nthambi"
-                }
-                
-                record_id = await self.airtable_client.create_issue(data)
-            
-            return record_id
+            data = self._entry_record_data(parsed_entry)
+            creator = {
+                "expense": self.airtable_client.create_expense,
+                "fuel": self.airtable_client.create_fuel_log,
+                "task": self.airtable_client.create_task,
+                "issue": self.airtable_client.create_issue,
+            }.get(parsed_entry.type.value)
+            return await creator(data) if creator else None
             
         except Exception as e:
             logger.error(f"Error storing entry in Airtable: {e}")
             return None
     
+    async def store_entries_in_airtable(self, parsed_entries: list) -> List[Optional[str]]:
+        """Store parsed entries with one batched create per table; IDs line up with the entries."""
+        bulk_creators = {
+            "expense": self.airtable_client.create_expense_bulk,
+            "fuel": self.airtable_client.create_fuel_log_bulk,
+            "task": self.airtable_client.create_task_bulk,
+            "issue": self.airtable_client.create_issue_bulk,
+        }
+        record_ids: List[Optional[str]] = [None] * len(parsed_entries)
+        
+        # Group entry positions by table so each table gets one batched request
+        groups: Dict[str, List[int]] = {}
+        for i, entry in enumerate(parsed_entries):
+            groups.setdefault(entry.type.value, []).append(i)
+        
+        async def store_group(entry_type: str, positions: List[int]):
+            # Tables are independent, so their writes overlap; the client bounds how
+            # many requests are in flight
+            data_list = [self._entry_record_data(parsed_entries[i]) for i in positions]
+            created = await bulk_creators[entry_type](data_list)
+            for i, record_id in zip(positions, created):
+                record_ids[i] = record_id
+        
+        results = await asyncio.gather(
+            *(store_group(entry_type, positions) for entry_type, positions in groups.items()),
+            return_exceptions=True
+        )
+        for entry_type, result in zip(groups, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error storing {entry_type} entries in Airtable: {result}")
+        
+        return record_ids
+    
+    def _entry_record_data(self, parsed_entry) -> Dict[str, Any]:
+        """Build the Airtable client input for a parsed entry."""
+        data: Dict[str, Any] = {}
+        
+        if parsed_entry.type.value == "expense":
+            data = {
+                "date": parsed_entry.date,
+                "amount": parsed_entry.amount,
+                "description": parsed_entry.description,
+                "person": parsed_entry.person or "Me"
+            }
+            if parsed_entry.receipt_url:
+                data["receipt_url"] = parsed_entry.receipt_url
+        
+        elif parsed_entry.type.value == "fuel":
+            data = {
+                "date": parsed_entry.date,
+                "vehicle": parsed_entry.vehicle,
+                "driver": parsed_entry.driver,
+                "liters": parsed_entry.liters,
+                "purpose": parsed_entry.purpose or ""
+            }
+            if parsed_entry.odometer_start:
+                data["odometer_start"] = parsed_entry.odometer_start
+            if parsed_entry.odometer_end:
+                data["odometer_end"] = parsed_entry.odometer_end
+        
+        elif parsed_entry.type.value == "task":
+            data = {
+                "date": parsed_entry.date,
+                "task_title": parsed_entry.task_title,
+                "details": parsed_entry.details or "",
+                "status": parsed_entry.status or "To Do",
+                "assigned_to": parsed_entry.assigned_to or "Nthambi"
+            }
+            if parsed_entry.deadline:
+                data["deadline"] = parsed_entry.deadline
+        
+        elif parsed_entry.type.value == "issue":
+            # Use description if available, otherwise use task_title (for misclassified entries)
+            description = parsed_entry.description or parsed_entry.task_title or "No description provided"
+            
+            # Fix status mapping for Issues table (only "Open" or "Resolved" allowed)
+            issue_status = "Open"  # Default for new issues
+            if parsed_entry.status and parsed_entry.status in ["Open", "Resolved"]:
+                issue_status = parsed_entry.status
+            
+            data = {
+                "date": parsed_entry.date,
+                "description": description,
+                "category": parsed_entry.category or "Other",
+                "severity": parsed_entry.severity or "Low",
+                "status": issue_status,
+                "reported_by": parsed_entry.reported_by or "Nthambi"
+            }
+        
+        return data
+    
     async def process_callback(self, callback_query: Dict[str, Any]):
         """Process callback queries (for buttons, etc.)."""
         # TODO: Implement callback processing
         pass
     
+    def _get_telegram_http(self) -> Optional[httpx.AsyncClient]:
+        """Return the shared Bot API client, creating it on first use so its connections are reused."""
+        if self.telegram_http is None:
+            token = os.getenv('TELEGRAM_TOKEN')
+            if token:
+                self.telegram_http = httpx.AsyncClient(
+                    base_url=f"https://api.telegram.org/bot{token}",
+                    http2=True,
+                    timeout=10.0,
+                    limits=httpx.Limits(max_connections=50, max_keepalive_connections=20)
+                )
+        return self.telegram_http
+    
+    @asynccontextmanager
+    async def _lifespan(self, app: FastAPI):
+        """Close outgoing connections when the app shuts down."""
+        yield
+        await self.aclose()
+    
+    async def aclose(self):
+        """Send any queued replies, then close the Telegram and Airtable connection pools."""
+        await self._outbox.drain()
+        if self.telegram_http is not None:
+            await self.telegram_http.aclose()
+            self.telegram_http = None
+        if self.airtable_client is not None:
+            await self.airtable_client.aclose()
+    
     async def send_message(self, chat_id: int, text: str) -> bool:
+        """Queue a message for the Telegram user; queued messages are sent together on the next flush.
+        
+        Always returns True, meaning the message was queued. Delivery failures surface later
+        and are logged by _send_now.
+        """
+        self._outbox.put(chat_id, text)
+        return True
+    
+    async def _send_now(self, chat_id: int, text: str) -> bool:
         """Send message back to Telegram user."""
         try:
-            from telegram import Bot
-            
-            token = os.getenv('TELEGRAM_TOKEN')
-            if not token:
+            telegram_http = self._get_telegram_http()
+            if not telegram_http:
                 logger.error("No TELEGRAM_TOKEN found")
                 return False
             
-            bot = Bot(token=token)
-            await bot.send_message(chat_id=chat_id, text=text)
-            logger.info(f"Sent message to {chat_id}: {text}")
+            response = await telegram_http.post("/sendMessage", json={"chat_id": chat_id, "text": text})
+            response.raise_for_status()
+            logger.info("Sent message to %s: %s", chat_id, text)
             return True
         except Exception as e:
             logger.error(f"Failed to send message: {e}")
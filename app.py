@@ -2,134 +2,427 @@
 """
 Main application entry point for Render deployment.
 This file serves as the primary entry point for the service.
+
+APP_MODE selects which FastAPI app is served:
+- handler (default): the TelegramHandler app from api.telegram_handler
+- full: webhook processing with GPT parsing and Airtable storage
+- simple: webhook endpoints that only acknowledge updates
+- standalone: no bot modules at all, for checking the deployment itself
 """
 
 import os
-import json
 import logging
-from http.server import HTTPServer, BaseHTTPRequestHandler
-from urllib.parse import urlparse
-from socketserver import ThreadingMixIn
+import importlib
+from contextlib import asynccontextmanager
+from typing import Dict, Any, Optional
+
+import orjson
+import uvicorn
+from fastapi import FastAPI, Request, HTTPException
+from fastapi.responses import Response
+from dotenv import load_dotenv
+
+from utils.outbox import Outbox
+
+# Load environment variables
+load_dotenv()
+
+# Configuration, read once at import
+APP_MODE = os.getenv('APP_MODE', 'handler')
+TELEGRAM_TOKEN = os.getenv('TELEGRAM_TOKEN')
+AIRTABLE_API_KEY = os.getenv('AIRTABLE_API_KEY')
+AIRTABLE_BASE_ID = os.getenv('AIRTABLE_BASE_ID')
+OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
 
 # Setup basic logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-class ThreadedHTTPServer(ThreadingMixIn, HTTPServer):
-    """Handle requests in a separate thread."""
-    pass
+# Components used by the full app
+airtable_client = None
+gpt_parser = None
+# Shared Bot for outgoing replies, so they reuse its pooled connections;
+# telegram is only imported when the first reply goes out
+bot = None
+# api.summary_generator, imported on the first /daily-summary call
+_summary_generator = None
+
+def json_constant(body: Dict[str, str]) -> Response:
+    """Serialize a constant JSON body once into a reusable response."""
+    return Response(content=orjson.dumps(body), media_type="application/json")
+
+# Prebuilt responses for the endpoints whose bodies never change
+ROOT_RESPONSE = json_constant({
+    "message": "Service Station Operations Bot API",
+    "status": "running",
+    "version": "1.0.0"
+})
+SIMPLE_HEALTH_RESPONSE = json_constant({"status": "healthy", "message": "Bot is running"})
+SIMPLE_WEBHOOK_RESPONSE = json_constant({"status": "ok", "message": "Webhook received"})
+SIMPLE_SUMMARY_RESPONSE = json_constant({"status": "summary_triggered", "message": "Daily summary endpoint"})
+STANDALONE_ROOT_RESPONSE = json_constant({
+    "message": "Standalone Service Station Operations Bot API",
+    "status": "running",
+    "version": "1.0.0"
+})
+STANDALONE_HEALTH_RESPONSE = json_constant({"status": "healthy", "message": "Standalone bot is running"})
+STANDALONE_TEST_RESPONSE = json_constant({"message": "Test endpoint working"})
+
+def create_app(mode: str = "handler") -> FastAPI:
+    """Build the FastAPI app for the given APP_MODE."""
+    if mode == "handler":
+        from api.telegram_handler import app
+        return app
+    if mode == "full":
+        return _create_full_app()
+    if mode == "simple":
+        return _create_simple_app()
+    if mode == "standalone":
+        return _create_standalone_app()
+    raise ValueError(f"Unknown APP_MODE '{mode}' (expected handler, full, simple or standalone)")
 
-class SimpleHTTPRequestHandler(BaseHTTPRequestHandler):
-    """Simple HTTP request handler."""
+def _create_full_app() -> FastAPI:
+    """Webhook app that parses messages with GPT and stores them in Airtable."""
+    from utils.logging_config import setup_logging
     
-    def do_GET(self):
-        """Handle GET requests."""
-        parsed_path = urlparse(self.path)
-        path = parsed_path.path
+    # Setup logging
+    setup_logging()
+    
+    def initialize_components():
+        """Create the Airtable client and GPT parser from the environment."""
+        global airtable_client, gpt_parser
         
-        if path == "/":
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
-            response = {
-                "message": "Service Station Operations Bot API",
-                "status": "running",
-                "version": "1.0.0"
-            }
-            self.wfile.write(json.dumps(response).encode())
+        try:
+            from api.airtable_client import AirtableClient
+            from api.gpt_parser import GPTParser
             
-        elif path == "/health":
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
-            response = {
-                "status": "healthy",
-                "message": "Bot is running"
-            }
-            self.wfile.write(json.dumps(response).encode())
+            # The Telegram bot itself is created on the first reply
+            if not TELEGRAM_TOKEN:
+                logger.error("No TELEGRAM_TOKEN found")
+            
+            # Initialize Airtable client
+            if not AIRTABLE_API_KEY or not AIRTABLE_BASE_ID:
+                logger.error("Missing Airtable credentials")
+                return
+            
+            airtable_client = AirtableClient(AIRTABLE_API_KEY, AIRTABLE_BASE_ID)
+            logger.info("✅ Airtable client initialized")
             
-        elif path == "/telegram-webhook":
-            # Handle GET requests to the webhook endpoint for testing
-            logger.info("GET request to /telegram-webhook - This is for testing only")
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
-            response = {"status": "ok", "message": "Webhook endpoint is active"}
-            self.wfile.write(json.dumps(response).encode())
+            # Initialize GPT parser
+            if not OPENAI_API_KEY:
+                logger.error("Missing OpenAI API key")
+                return
+            
+            gpt_parser = GPTParser(OPENAI_API_KEY)
+            logger.info("✅ GPT parser initialized")
+            
+        except Exception as e:
+            logger.error(f"Failed to initialize components: {e}")
+    
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        """Initialize components on startup; send queued replies and shut the bot down on exit."""
+        initialize_components()
+        yield
+        await outbox.drain()
+        if bot:
+            await bot.shutdown()
+    
+    app = FastAPI(
+        title="Service Station Operations Bot",
+        description="Telegram bot for managing service station operations, fuel logs, petty cash, and tasks/issues",
+        version="1.0.0",
+        lifespan=lifespan
+    )
+    
+    @app.get("/")
+    async def root() -> Response:
+        """Root endpoint."""
+        return ROOT_RESPONSE
+    
+    @app.get("/health")
+    async def health_check() -> Dict[str, Any]:
+        """Health check endpoint."""
+        return {
+            "status": "healthy",
+            "airtable_ready": airtable_client is not None,
+            "gpt_ready": gpt_parser is not None
+        }
+    
+    @app.post("/telegram-webhook")
+    async def telegram_webhook(request: Request) -> Dict[str, str]:
+        """Handle incoming Telegram webhook updates."""
+        # Only message/callback_query are read, so skip model validation and decode the bytes directly
+        try:
+            update = orjson.loads(await request.body())
+        except orjson.JSONDecodeError:
+            raise HTTPException(status_code=400, detail="Invalid JSON")
+        if not isinstance(update, dict):
+            raise HTTPException(status_code=400, detail="Invalid update")
+        
+        try:
+            if update.get("message"):
+                await process_message(update["message"])
+            elif update.get("callback_query"):
+                await process_callback(update["callback_query"])
+            return {"status": "ok"}
+        except Exception as e:
+            logger.error(f"Error processing webhook: {e}")
+            raise HTTPException(status_code=500, detail=str(e))
+    
+    @app.post("/daily-summary")
+    async def trigger_daily_summary() -> Dict[str, str]:
+        """Manually trigger daily summary generation."""
+        try:
+            await get_summary_generator().send_summary_to_configured_chat()
+            return {"status": "summary_triggered"}
+        except Exception as e:
+            logger.error(f"Error triggering daily summary: {e}")
+            raise HTTPException(status_code=500, detail=str(e))
+    
+    return app
+
+def _create_simple_app() -> FastAPI:
+    """Webhook app that acknowledges updates without processing them."""
+    app = FastAPI(
+        title="Service Station Operations Bot",
+        description="Telegram bot for managing service station operations",
+        version="1.0.0"
+    )
+    
+    @app.get("/")
+    async def root() -> Response:
+        """Root endpoint."""
+        return ROOT_RESPONSE
+    
+    @app.get("/health")
+    async def health_check() -> Response:
+        """Health check endpoint."""
+        return SIMPLE_HEALTH_RESPONSE
+    
+    @app.post("/telegram-webhook")
+    async def telegram_webhook() -> Response:
+        """Acknowledge incoming Telegram webhook updates without reading them."""
+        return SIMPLE_WEBHOOK_RESPONSE
+    
+    @app.post("/daily-summary")
+    async def trigger_daily_summary() -> Response:
+        """Manually trigger daily summary generation."""
+        return SIMPLE_SUMMARY_RESPONSE
+    
+    return app
+
+def _create_standalone_app() -> FastAPI:
+    """App with no bot modules, to check that the service itself starts."""
+    app = FastAPI(
+        title="Service Station Operations Bot",
+        description="Standalone test version",
+        version="1.0.0"
+    )
+    
+    @app.get("/")
+    async def root() -> Response:
+        """Root endpoint."""
+        return STANDALONE_ROOT_RESPONSE
+    
+    @app.get("/health")
+    async def health_check() -> Response:
+        """Health check endpoint."""
+        return STANDALONE_HEALTH_RESPONSE
+    
+    @app.get("/test")
+    async def test() -> Response:
+        """Test endpoint."""
+        return STANDALONE_TEST_RESPONSE
+    
+    return app
+
+async def process_message(message: Dict[str, Any]):
+    """Process incoming Telegram message."""
+    try:
+        if not gpt_parser:
+            logger.error("GPT parser not initialized")
+            return
+        
+        # Extract text from message
+        text = message.get('text', '')
+        chat_id = message.get('chat', {}).get('id')
+        
+        if not text:
+            return
+        
+        logger.info("Processing message: %.100s...", text)
+        
+        # Parse with GPT
+        parsed_entry = await gpt_parser.parse_message(text)
+        
+        if parsed_entry:
+            # Store in Airtable
+            record_id = await store_entry_in_airtable(parsed_entry)
             
+            if record_id:
+                response = f"✅ Entry recorded successfully! Record ID: {record_id}"
+            else:
+                response = "❌ Failed to store entry in database"
         else:
-            self.send_response(404)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
-            response = {"error": "Not found"}
-            self.wfile.write(json.dumps(response).encode())
-    
-    def do_POST(self):
-        """Handle POST requests."""
-        parsed_path = urlparse(self.path)
-        path = parsed_path.path
+            response = "❌ Could not parse message. Please try again with clearer information."
+        
+        # Queue response for the user; replies to the same chat within a flush are sent together
+        if chat_id:
+            outbox.put(chat_id, response)
+            
+    except Exception as e:
+        logger.error(f"Error processing message: {e}")
+
+async def store_entry_in_airtable(parsed_entry) -> Optional[str]:
+    """Store a parsed entry in Airtable and return the record ID."""
+    try:
+        if not airtable_client:
+            logger.error("Airtable client not initialized")
+            return None
+            
+        record_id = None
         
-        if path == "/telegram-webhook":
-            # Process Telegram webhook
-            content_length = int(self.headers.get('Content-Length', 0))
-            post_data = self.rfile.read(content_length)
+        if parsed_entry.type.value == "expense":
+            data = {
+                "date": parsed_entry.date,
+                "amount": parsed_entry.amount,
+                "description": parsed_entry.description,
+                "person": parsed_entry.person or "Me"
+            }
+            if parsed_entry.receipt_url:
+                data["receipt_url"] = parsed_entry.receipt_url
             
-            try:
-                # Log the received data
-                logger.info(f"Received webhook data: {post_data.decode('utf-8')}")
-                
-                # Parse JSON data
-                update = json.loads(post_data.decode('utf-8'))
-                
-                # Extract message if available
-                message = update.get('message', {})
-                chat_id = message.get('chat', {}).get('id')
-                text = message.get('text', '')
-                
-                if chat_id and text:
-                    logger.info(f"Received message from {chat_id}: {text}")
-                    # Here you would process the message
-                    # For now, just log it
-                
-            except Exception as e:
-                logger.error(f"Error processing webhook: {e}")
+            record_id = await airtable_client.create_expense(data)
             
-            # Always respond with 200 OK to Telegram
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
-            response = {"status": "ok", "message": "Webhook received"}
-            self.wfile.write(json.dumps(response).encode())
+        elif parsed_entry.type.value == "fuel":
+            data = {
+                "date": parsed_entry.date,
+                "vehicle": parsed_entry.vehicle,
+                "driver": parsed_entry.driver,
+                "liters": parsed_entry.liters,
+                "purpose": parsed_entry.purpose or ""
+            }
+            if parsed_entry.odometer_start:
+                data["odometer_start"] = parsed_entry.odometer_start
+            if parsed_entry.odometer_end:
+                data["odometer_end"] = parsed_entry.odometer_end
             
-        elif path == "/daily-summary":
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
-            response = {"status": "summary_triggered", "message": "Daily summary endpoint"}
-            self.wfile.write(json.dumps(response).encode())
+            record_id = await airtable_client.create_fuel_log(data)
+        
+        elif parsed_entry.type.value == "task":
+            data = {
+                "date": parsed_entry.date,
+                "task_title": parsed_entry.task_title,
+                "details": parsed_entry.details or "",
+                "status": parsed_entry.status or "To Do",
+                "assigned_to": parsed_entry.assigned_to or "Nthambi"
+            }
+            if parsed_entry.deadline:
+                data["deadline"] = parsed_entry.deadline
             
-        else:
-            self.send_response(404)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
-            response = {"error": "Not found"}
-            self.wfile.write(json.dumps(response).encode())
-    
-    def log_message(self, format, *args):
-        """Log all requests."""
-        logger.info(f"{self.address_string()} - {format % args}")
+            record_id = await airtable_client.create_task(data)
+        
+        elif parsed_entry.type.value == "issue":
+            description = parsed_entry.description or parsed_entry.task_title or "No description provided"
+            issue_status = "Open"
+            if parsed_entry.status and parsed_entry.status in ["Open", "Resolved"]:
+                issue_status = parsed_entry.status
+            
+            data = {
+                "date": parsed_entry.date,
+                "description": description,
+                "category": parsed_entry.category or "Other",
+                "severity": parsed_entry.severity or "Low",
+                "status": issue_status,
+                "reported_by": parsed_entry.reported_by or "Nthambi"
+            }
+            
+            record_id = await airtable_client.create_issue(data)
+        
+        return record_id
+        
+    except Exception as e:
+        logger.error(f"Error storing entry in Airtable: {e}")
+        return None
+
+async def process_callback(callback_query: Dict[str, Any]):
+    """Process callback queries (for buttons, etc.)."""
+    # TODO: Implement callback processing
+    pass
+
+def get_bot():
+    """Return the shared Telegram Bot, importing telegram and creating it on first use."""
+    global bot
+    if bot is None and TELEGRAM_TOKEN:
+        from telegram import Bot
+        from telegram.request import HTTPXRequest
+        
+        bot = Bot(token=TELEGRAM_TOKEN, request=HTTPXRequest(connection_pool_size=64, http_version="2"))
+        logger.info("✅ Telegram bot initialized")
+    return bot
+
+def get_summary_generator():
+    """Return the daily summary generator, importing its module on first use."""
+    global _summary_generator
+    if _summary_generator is None:
+        _summary_generator = importlib.import_module("api.summary_generator").generator
+    return _summary_generator
+
+async def send_message(chat_id: int, text: str) -> bool:
+    """Send message back to Telegram user."""
+    try:
+        telegram_bot = get_bot()
+        if not telegram_bot:
+            logger.error("Telegram bot not initialized")
+            return False
+        
+        # No-op once done; paired with bot.shutdown() in the full app's lifespan
+        await telegram_bot.initialize()
+        await telegram_bot.send_message(chat_id=chat_id, text=text)
+        logger.info("Sent message to %s: %s", chat_id, text)
+        return True
+    except Exception as e:
+        logger.error(f"Failed to send message: {e}")
+        return False
+
+# Replies are batched per chat and sent every 500ms
+outbox = Outbox(send_message, flush_interval=0.5)
+
+# Built on first access (e.g. "uvicorn app:app"), so modules that only import
+# create_app, such as wsgi.py, don't build a second app with its own startup hooks
+_app: Optional[FastAPI] = None
+
+def get_app() -> FastAPI:
+    """Return the APP_MODE app, building it on first use."""
+    global _app
+    if _app is None:
+        _app = create_app(APP_MODE)
+    return _app
+
+def __getattr__(name: str):
+    """Resolve the module-level `app` lazily through get_app()."""
+    if name == "app":
+        return get_app()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 def run_server(host='0.0.0.0', port=8000):
-    """Run the HTTP server."""
-    server_address = (host, port)
-    httpd = ThreadedHTTPServer(server_address, SimpleHTTPRequestHandler)
-    logger.info(f"Starting server on {host}:{port}")
+    """Run the selected FastAPI app under uvicorn."""
+    logger.info(f"Starting server on {host}:{port} (APP_MODE={APP_MODE})")
     logger.info(f"Server running at http://{host}:{port}")
-    try:
-        httpd.serve_forever()
-    except KeyboardInterrupt:
-        logger.info("Shutting down server...")
-        httpd.shutdown()
+    # Bound in-flight requests so a burst of webhook retries gets 503s instead of piling up
+    workers = os.environ.get('WEBHOOK_WORKERS')
+    limit_concurrency = int(workers) if workers and workers.isdigit() else None
+    # httptools C parser instead of a thread per request; "auto" uses uvloop where it's
+    # installed (it isn't on Windows) and the stdlib loop otherwise
+    uvicorn.run(
+        get_app(),
+        host=host,
+        port=port,
+        loop="auto",
+        http="httptools",
+        limit_concurrency=limit_concurrency
+    )
 
 if __name__ == "__main__":
     # Get port from environment variable or use default
@@ -5,14 +5,21 @@ This version is designed to run as a Background Worker service that can still ha
 """
 
 import os
-import json
 import logging
 import asyncio
-from http.server import HTTPServer, BaseHTTPRequestHandler
-from urllib.parse import urlparse
-from socketserver import ThreadingMixIn
-from typing import Optional
-import threading
+from contextlib import asynccontextmanager
+from typing import Dict
+
+import orjson
+import uvicorn
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from fastapi import FastAPI, Request
+from fastapi.responses import Response
+
+try:
+    import uvloop
+except ImportError:  # not available on Windows
+    uvloop = None
 
 # Setup basic logging
 logging.basicConfig(level=logging.INFO)
@@ -37,123 +44,130 @@ except ImportError as e:
 airtable_client = None
 gpt_parser = None
 telegram_handler = None
+# Fire-and-forget tasks, referenced until done so they aren't garbage collected mid-run
+_pending_tasks: set = set()
+
+# Constant response bodies, serialized once instead of on every request
+ROOT_BYTES = orjson.dumps({
+    "message": "Service Station Operations Bot - Background Worker",
+    "status": "running",
+    "version": "1.0.0",
+    "service_type": "background_worker",
+    "modules_loaded": MODULES_AVAILABLE
+})
+TEST_WEBHOOK_BYTES = orjson.dumps({"status": "ok", "message": "Webhook endpoint is active (Background Worker)"})
+NOT_FOUND_BYTES = orjson.dumps({"error": "Not found"})
+
+def render_health() -> bytes:
+    """Serialize the health response; component readiness only changes during initialization."""
+    return orjson.dumps({
+        "status": "healthy",
+        "message": "Background Worker Bot is running",
+        "airtable_ready": airtable_client is not None,
+        "gpt_ready": gpt_parser is not None,
+        "telegram_ready": telegram_handler is not None
+    })
+
+_HEALTH_BYTES = render_health()
+
+def json_bytes_response(body: bytes, status_code: int = 200) -> Response:
+    """Wrap an already serialized JSON body in a response."""
+    return Response(content=body, status_code=status_code, media_type="application/json")
 
-class ThreadedHTTPServer(ThreadingMixIn, HTTPServer):
-    """Handle requests in a separate thread."""
-    allow_reuse_address = True
-    daemon_threads = True
+# GET paths answered with a constant body; None means the current health body
+_GET_TABLE = {
+    "/": ROOT_BYTES,
+    "/health": None,
+    "/telegram-webhook": TEST_WEBHOOK_BYTES,
+}
 
-class BackgroundWorkerHTTPHandler(BaseHTTPRequestHandler):
-    """HTTP request handler for Background Worker."""
+class ConstantGetMiddleware:
+    """Answer the constant GET endpoints with one dict lookup, before FastAPI's route matching."""
     
-    def do_GET(self):
-        """Handle GET requests."""
-        parsed_path = urlparse(self.path)
-        path = parsed_path.path
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "GET" or scope["path"] not in _GET_TABLE:
+            await self.app(scope, receive, send)
+            return
         
-        if path == "/":
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
-            response = {
-                "message": "Service Station Operations Bot - Background Worker",
-                "status": "running",
-                "version": "1.0.0",
-                "service_type": "background_worker",
-                "modules_loaded": MODULES_AVAILABLE
-            }
-            self.wfile.write(json.dumps(response).encode())
-            
-        elif path == "/health":
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
-            response = {
-                "status": "healthy",
-                "message": "Background Worker Bot is running",
-                "airtable_ready": airtable_client is not None,
-                "gpt_ready": gpt_parser is not None,
-                "telegram_ready": telegram_handler is not None
-            }
-            self.wfile.write(json.dumps(response).encode())
-            
+        path = scope["path"]
+        body = _GET_TABLE[path]
+        if body is None:
+            body = _HEALTH_BYTES
         elif path == "/telegram-webhook":
-            # Handle GET requests to the webhook endpoint for testing
             logger.info("GET request to /telegram-webhook - This is for testing only")
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
-            response = {"status": "ok", "message": "Webhook endpoint is active (Background Worker)"}
-            self.wfile.write(json.dumps(response).encode())
-            
-        else:
-            self.send_response(404)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
-            response = {"error": "Not found"}
-            self.wfile.write(json.dumps(response).encode())
+        
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Run scheduled jobs on the same loop as the webhook endpoints."""
+    scheduler = create_scheduler()
+    scheduler.start()
+    yield
+    scheduler.shutdown(wait=False)
+
+app = FastAPI(title="Service Station Ops Bot - Background Worker", lifespan=lifespan)
+app.add_middleware(ConstantGetMiddleware)
+
+@app.exception_handler(404)
+async def not_found(request: Request, exc: Exception) -> Response:
+    """Keep the worker's original 404 body."""
+    return json_bytes_response(NOT_FOUND_BYTES, status_code=404)
+
+@app.post("/telegram-webhook")
+async def telegram_webhook(request: Request) -> Dict[str, str]:
+    """Acknowledge a Telegram update and process it in the background."""
+    post_data = await request.body()
     
-    def do_POST(self):
-        """Handle POST requests."""
-        parsed_path = urlparse(self.path)
-        path = parsed_path.path
+    try:
+        # Log the received data
+        logger.info("Received webhook data: %s", post_data)
         
-        if path == "/telegram-webhook":
-            # Process Telegram webhook
-            content_length = int(self.headers.get('Content-Length', 0))
-            post_data = self.rfile.read(content_length)
-            
-            try:
-                # Log the received data
-                logger.info(f"Received webhook data: {post_data.decode('utf-8')}")
-                
-                # Parse JSON data
-                update = json.loads(post_data.decode('utf-8'))
-                
-                # Process the update asynchronously
-                if MODULES_AVAILABLE and telegram_handler:
-                    asyncio.create_task(process_telegram_update(update))
-                else:
-                    logger.warning("Telegram handler not available, skipping message processing")
-                
-            except Exception as e:
-                logger.error(f"Error processing webhook: {e}")
-            
-            # Always respond with 200 OK to Telegram
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
-            response = {"status": "ok", "message": "Webhook received"}
-            self.wfile.write(json.dumps(response).encode())
-            
-        elif path == "/daily-summary":
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
-            
-            # Trigger daily summary if modules are available
-            if MODULES_AVAILABLE:
-                try:
-                    asyncio.create_task(trigger_daily_summary())
-                    response = {"status": "summary_triggered", "message": "Daily summary initiated"}
-                except Exception as e:
-                    logger.error(f"Error triggering summary: {e}")
-                    response = {"status": "error", "message": str(e)}
-            else:
-                response = {"status": "unavailable", "message": "Summary modules not loaded"}
-            
-            self.wfile.write(json.dumps(response).encode())
-            
+        # Parse JSON data
+        update = orjson.loads(post_data)
+        
+        # Process the update asynchronously
+        if MODULES_AVAILABLE and telegram_handler:
+            submit(process_telegram_update(update))
         else:
-            self.send_response(404)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
-            response = {"error": "Not found"}
-            self.wfile.write(json.dumps(response).encode())
+            logger.warning("Telegram handler not available, skipping message processing")
+    
+    except Exception as e:
+        logger.error(f"Error processing webhook: {e}")
     
-    def log_message(self, format, *args):
-        """Log all requests."""
-        logger.info(f"{self.address_string()} - {format % args}")
+    # Always respond with 200 OK to Telegram
+    return {"status": "ok", "message": "Webhook received"}
+
+@app.post("/daily-summary")
+async def daily_summary() -> Dict[str, str]:
+    """Trigger the daily summary in the background."""
+    if not MODULES_AVAILABLE:
+        return {"status": "unavailable", "message": "Summary modules not loaded"}
+    
+    try:
+        submit(trigger_daily_summary())
+        return {"status": "summary_triggered", "message": "Daily summary initiated"}
+    except Exception as e:
+        logger.error(f"Error triggering summary: {e}")
+        return {"status": "error", "message": str(e)}
+
+def submit(coro) -> asyncio.Task:
+    """Run a coroutine in the background without delaying the HTTP response."""
+    task = asyncio.create_task(coro)
+    _pending_tasks.add(task)
+    task.add_done_callback(_pending_tasks.discard)
+    return task
 
 async def process_telegram_update(update: dict):
     """Process Telegram update asynchronously."""
@@ -176,7 +190,7 @@ async def trigger_daily_summary():
 
 def initialize_components():
     """Initialize all bot components."""
-    global airtable_client, gpt_parser, telegram_handler
+    global airtable_client, gpt_parser, telegram_handler, _HEALTH_BYTES
     
     if not MODULES_AVAILABLE:
         logger.warning("Modules not available, running in minimal mode")
@@ -213,42 +227,40 @@ def initialize_components():
             
     except Exception as e:
         logger.error(f"❌ Error initializing components: {e}")
+    
+    _HEALTH_BYTES = render_health()
 
-def run_http_server(host='0.0.0.0', port=10000):
-    """Run the HTTP server for webhook endpoints."""
+def create_scheduler() -> AsyncIOScheduler:
+    """Schedule the daily summary for DAILY_SUMMARY_TIME_UTC (HH:MM, default 15:00)."""
+    summary_time = os.environ.get('DAILY_SUMMARY_TIME_UTC', '15:00')
     try:
-        server_address = (host, port)
-        httpd = ThreadedHTTPServer(server_address, BackgroundWorkerHTTPHandler)
-        
-        logger.info(f"🌐 HTTP Server starting on {host}:{port}")
-        logger.info(f"🔗 Webhook URL: http://{host}:{port}/telegram-webhook")
-        logger.info(f"❤️ Health check: http://{host}:{port}/health")
-        
-        # Run server in a separate thread so it doesn't block the main process
-        server_thread = threading.Thread(target=httpd.serve_forever, daemon=True)
-        server_thread.start()
-        
-        return httpd, server_thread
-        
-    except Exception as e:
-        logger.error(f"❌ Failed to start HTTP server: {e}")
-        return None, None
-
-async def background_tasks():
-    """Run background tasks (like periodic summaries)."""
-    logger.info("🔄 Background tasks loop started")
+        hour, minute = (int(part) for part in summary_time.split(':'))
+    except ValueError:
+        hour, minute = 15, 0
+        logger.warning(f"Invalid DAILY_SUMMARY_TIME_UTC value '{summary_time}', using 15:00")
     
-    while True:
-        try:
-            # Add any periodic background tasks here
-            # For example, health checks, cleanup, etc.
-            
-            # Sleep for 60 seconds before next iteration
-            await asyncio.sleep(60)
-            
-        except Exception as e:
-            logger.error(f"Error in background tasks: {e}")
-            await asyncio.sleep(60)
+    # The loop only wakes when a job is due, instead of polling
+    scheduler = AsyncIOScheduler(timezone="UTC")
+    scheduler.add_job(
+        trigger_daily_summary,
+        "cron",
+        hour=hour,
+        minute=minute,
+        coalesce=True,
+        misfire_grace_time=600
+    )
+    logger.info(f"⏰ Daily summary scheduled for {hour:02d}:{minute:02d} UTC")
+    return scheduler
+
+def new_event_loop() -> asyncio.AbstractEventLoop:
+    """Create the worker's event loop, using uvloop when it is installed."""
+    loop = uvloop.new_event_loop() if uvloop is not None else asyncio.new_event_loop()
+    # Python 3.12+: tasks run synchronously until their first real await, and
+    # ones that finish without suspending never get scheduled on the loop
+    if hasattr(asyncio, "eager_task_factory"):
+        loop.set_task_factory(asyncio.eager_task_factory)
+    return loop
+
 
 def main():
     """Main function to run the Background Worker."""
@@ -270,33 +282,39 @@ def main():
     host = '0.0.0.0'
     
     logger.info(f"🔌 Using port: {port} (Background Worker)")
-    
-    # Start HTTP server for webhooks
-    httpd, server_thread = run_http_server(host, port)
-    
-    if not httpd:
-        logger.error("❌ Failed to start HTTP server, exiting")
-        return
-    
+    logger.info(f"🔗 Webhook URL: http://{host}:{port}/telegram-webhook")
+    logger.info(f"❤️ Health check: http://{host}:{port}/health")
     logger.info("🚀 Background Worker is ready!")
-    logger.info("📱 Webhook endpoints are active")
     logger.info("⏹️  Press Ctrl+C to stop")
     logger.info("=" * 60)
     
+    # One asyncio loop serves the webhooks and runs the background tasks;
+    # uvicorn turns Ctrl+C / SIGTERM into a graceful shutdown
+    # Bound in-flight requests so a burst of webhook retries gets 503s instead of piling up
+    workers = os.environ.get('WEBHOOK_WORKERS')
+    limit_concurrency = int(workers) if workers and workers.isdigit() else None
+    config = uvicorn.Config(
+        app,
+        host=host,
+        port=port,
+        http="httptools",
+        loop="none",
+        limit_concurrency=limit_concurrency,
+        # Per-request access lines are a synchronous write each; only keep them when debugging
+        access_log=logger.isEnabledFor(logging.DEBUG)
+    )
+    server = uvicorn.Server(config)
     try:
-        # Run background tasks
-        asyncio.run(background_tasks())
-        
+        with asyncio.Runner(loop_factory=new_event_loop) as runner:
+            runner.run(server.serve())
+        logger.info("✅ Background Worker stopped")
+    
     except KeyboardInterrupt:
-        logger.info("\n👋 Shutting down Background Worker...")
-        if httpd:
-            httpd.shutdown()
+        # uvicorn re-raises the captured Ctrl+C once it has shut down cleanly
         logger.info("✅ Background Worker stopped")
-        
+    
     except Exception as e:
         logger.error(f"❌ Fatal error in Background Worker: {e}")
-        if httpd:
-            httpd.shutdown()
 
 if __name__ == "__main__":
     main()
@@ -2,84 +2,126 @@
 """
 Simple HTTP server for the Service Station Operations Bot.
 Uses only standard library modules - no external dependencies.
+orjson is used for JSON when it is installed.
 """
 
 import os
 import json
+import socket
+import asyncio
 import logging
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from http import HTTPStatus
+from typing import Dict, NamedTuple, Optional
 from urllib.parse import urlparse, parse_qs
-from socketserver import ThreadingMixIn
+
+try:
+    import orjson
+except ImportError:  # stay runnable with the standard library alone
+    orjson = None
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
 
 # Setup basic logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-class ThreadedHTTPServer(ThreadingMixIn, HTTPServer):
-    """Handle requests in a separate thread."""
-    pass
+if orjson:
+    json_loads = orjson.loads
+    json_dumps = orjson.dumps
+else:
+    json_loads = json.loads
+    
+    def json_dumps(obj) -> bytes:
+        """Serialize obj to UTF-8 encoded JSON."""
+        return json.dumps(obj).encode()
+
+# Response bodies that never change, serialized once at import
+ROOT_BODY = json_dumps({
+    "message": "Service Station Operations Bot API",
+    "status": "running",
+    "version": "1.0.0"
+})
+HEALTH_BODY = json_dumps({"status": "healthy", "message": "Bot is running"})
+TEST_WEBHOOK_BODY = json_dumps({"status": "ok", "message": "Webhook endpoint is active"})
+WEBHOOK_ACK_BODY = json_dumps({"status": "ok", "message": "Webhook received"})
+SUMMARY_BODY = json_dumps({"status": "summary_triggered", "message": "Daily summary endpoint"})
+NOT_FOUND_BODY = json_dumps({"error": "Not found"})
+
+# Largest request line + headers accepted before the connection is dropped
+MAX_HEADER_BYTES = 65536
+# Largest request body accepted; Telegram updates are a few kilobytes
+MAX_BODY_BYTES = 1024 * 1024
+# Seconds a connection may wait for, or spend sending, one request
+REQUEST_TIMEOUT = 30
+
+class HTTPError(Exception):
+    """A request the server rejects with status before closing the connection."""
+    
+    def __init__(self, status: HTTPStatus):
+        super().__init__(status.phrase)
+        self.status = status
 
-class SimpleHTTPRequestHandler(BaseHTTPRequestHandler):
-    """Simple HTTP request handler."""
+class Request(NamedTuple):
+    """One parsed HTTP request."""
+    method: str
+    path: str
+    version: str
+    headers: Dict[str, str]
+    body: bytes
     
-    def do_GET(self):
+    @property
+    def keep_alive(self) -> bool:
+        """Whether the client wants the connection kept open after this request."""
+        connection = self.headers.get('connection', '').lower()
+        if self.version == 'HTTP/1.0':
+            return connection == 'keep-alive'
+        return connection != 'close'
+
+class RequestHandler:
+    """Routes parsed requests to the bot's endpoints; each route returns (status, body)."""
+    
+    def handle(self, request: Request):
+        """Dispatch a request on its method."""
+        if request.method == 'GET':
+            return self.do_GET(request)
+        if request.method == 'POST':
+            return self.do_POST(request)
+        return HTTPStatus.NOT_IMPLEMENTED, error_body(HTTPStatus.NOT_IMPLEMENTED)
+    
+    def do_GET(self, request: Request):
         """Handle GET requests."""
-        parsed_path = urlparse(self.path)
-        path = parsed_path.path
+        path = request.path
         
         if path == "/":
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
-            response = {
-                "message": "Service Station Operations Bot API",
-                "status": "running",
-                "version": "1.0.0"
-            }
-            self.wfile.write(json.dumps(response).encode())
+            return HTTPStatus.OK, ROOT_BODY
             
         elif path == "/health":
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
-            response = {
-                "status": "healthy",
-                "message": "Bot is running"
-            }
-            self.wfile.write(json.dumps(response).encode())
+            return HTTPStatus.OK, HEALTH_BODY
             
         elif path == "/telegram-webhook":
             # Also handle GET requests to the webhook endpoint for testing
             logger.info("GET request to /telegram-webhook - This is for testing only")
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
-            response = {"status": "ok", "message": "Webhook endpoint is active"}
-            self.wfile.write(json.dumps(response).encode())
+            return HTTPStatus.OK, TEST_WEBHOOK_BODY
             
-        else:
-            self.send_response(404)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
-            response = {"error": "Not found"}
-            self.wfile.write(json.dumps(response).encode())
+        return HTTPStatus.NOT_FOUND, NOT_FOUND_BODY
     
-    def do_POST(self):
+    def do_POST(self, request: Request):
         """Handle POST requests."""
-        parsed_path = urlparse(self.path)
-        path = parsed_path.path
+        path = request.path
         
         if path == "/telegram-webhook":
             # Process Telegram webhook
-            content_length = int(self.headers.get('Content-Length', 0))
-            post_data = self.rfile.read(content_length)
+            post_data = request.body
             
             try:
-                # Log the received data
-                logger.info(f"Received webhook data: {post_data.decode('utf-8')}")
+                # Log the received data; the full payload only when debugging
+                logger.debug("Received webhook data: %r", post_data)
                 
-                # Parse JSON data
-                update = json.loads(post_data.decode('utf-8'))
+                # Parse JSON straight from the raw bytes
+                update = json_loads(post_data)
                 
                 # Extract message if available
                 message = update.get('message', {})
@@ -87,49 +129,144 @@ class SimpleHTTPRequestHandler(BaseHTTPRequestHandler):
                 text = message.get('text', '')
                 
                 if chat_id and text:
-                    logger.info(f"Received message from {chat_id}: {text}")
+                    logger.info("Received message from %s: %s", chat_id, text)
                     # Here you would process the message
                     # For now, just log it
                 
             except Exception as e:
-                logger.error(f"Error processing webhook: {e}")
+                logger.error("Error processing webhook: %s", e)
             
             # Always respond with 200 OK to Telegram
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
-            response = {"status": "ok", "message": "Webhook received"}
-            self.wfile.write(json.dumps(response).encode())
+            return HTTPStatus.OK, WEBHOOK_ACK_BODY
             
         elif path == "/daily-summary":
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
-            response = {"status": "summary_triggered", "message": "Daily summary endpoint"}
-            self.wfile.write(json.dumps(response).encode())
+            return HTTPStatus.OK, SUMMARY_BODY
             
-        else:
-            self.send_response(404)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
-            response = {"error": "Not found"}
-            self.wfile.write(json.dumps(response).encode())
+        return HTTPStatus.NOT_FOUND, NOT_FOUND_BODY
+
+class AsyncHTTPServer:
+    """Single-threaded asyncio HTTP/1.1 server in front of a RequestHandler."""
+    
+    def __init__(self, handler=None):
+        self.handler = handler or RequestHandler()
     
-    def log_message(self, format, *args):
-        """Log all requests."""
-        logger.info(f"{self.address_string()} - {format % args}")
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serve requests on one connection until either side closes it."""
+        client_address = writer.get_extra_info('peername')
+        try:
+            while True:
+                try:
+                    async with asyncio.timeout(REQUEST_TIMEOUT):
+                        request = await read_request(reader)
+                except HTTPError as e:
+                    writer.write(build_response(e.status, error_body(e.status), keep_alive=False))
+                    await writer.drain()
+                    break
+                if request is None:
+                    break
+                
+                # The routes only do CPU work, so they run inline on the event loop
+                status, body = self.handler.handle(request)
+                keep_alive = request.keep_alive
+                writer.write(build_response(status, body, keep_alive))
+                await writer.drain()
+                
+                # Access log only when debug logging is on
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug('%s - "%s %s %s" %d', client_address, request.method, request.path, request.version, status)
+                if not keep_alive:
+                    break
+        except (ConnectionError, TimeoutError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+def error_body(status: HTTPStatus) -> bytes:
+    """JSON body for an error status."""
+    return json_dumps({"error": status.phrase})
+
+def build_response(status: HTTPStatus, body: bytes, keep_alive: bool = True) -> bytes:
+    """Serialize a JSON response with its status line and headers."""
+    head = (
+        f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+    )
+    if not keep_alive:
+        head += "Connection: close\r\n"
+    return head.encode('latin-1') + b"\r\n" + body
+
+async def read_line(reader: asyncio.StreamReader) -> bytes:
+    """Read one CRLF-terminated line of the request head."""
+    try:
+        return await reader.readline()
+    except ValueError:
+        # The line ran past the stream's buffer limit
+        raise HTTPError(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE)
+
+async def read_request(reader: asyncio.StreamReader) -> Optional[Request]:
+    """Read and parse one request from the stream, or None at end of stream."""
+    line = await read_line(reader)
+    if not line:
+        return None
+    
+    parts = line.split()
+    if len(parts) != 3 or not parts[2].startswith(b"HTTP/1."):
+        raise HTTPError(HTTPStatus.BAD_REQUEST)
+    method, target, version = (part.decode('latin-1') for part in parts)
+    
+    headers = {}
+    head_size = len(line)
+    while True:
+        line = await read_line(reader)
+        head_size += len(line)
+        if head_size > MAX_HEADER_BYTES:
+            raise HTTPError(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE)
+        if line in (b"\r\n", b"\n"):
+            break
+        name, sep, value = line.partition(b":")
+        if not line.endswith(b"\n") or not sep or not name.strip():
+            raise HTTPError(HTTPStatus.BAD_REQUEST)
+        headers[name.strip().lower().decode('latin-1')] = value.strip().decode('latin-1')
+    
+    # Bodies must be sent with Content-Length; chunked uploads aren't supported
+    if 'transfer-encoding' in headers:
+        raise HTTPError(HTTPStatus.NOT_IMPLEMENTED)
+    content_length = headers.get('content-length', '0')
+    if not content_length.isdigit():
+        raise HTTPError(HTTPStatus.BAD_REQUEST)
+    content_length = int(content_length)
+    if content_length > MAX_BODY_BYTES:
+        raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+    
+    body = await reader.readexactly(content_length) if content_length else b""
+    return Request(method, urlparse(target).path, version, headers, body)
+
+def new_event_loop() -> asyncio.AbstractEventLoop:
+    """Create the server's event loop, on uvloop when it is installed."""
+    return uvloop.new_event_loop() if uvloop else asyncio.new_event_loop()
+
+async def serve(port: int):
+    """Accept connections on port until cancelled."""
+    # SO_REUSEPORT lets several copies of this script share the port where the OS supports it
+    server = await asyncio.start_server(
+        AsyncHTTPServer().handle_connection,
+        host=None,
+        port=port,
+        reuse_port=hasattr(socket, 'SO_REUSEPORT')
+    )
+    async with server:
+        await server.serve_forever()
 
 def run_server(port=8000):
     """Run the HTTP server."""
-    server_address = ('', port)
-    httpd = ThreadedHTTPServer(server_address, SimpleHTTPRequestHandler)
     logger.info(f"Starting server on port {port}")
     logger.info(f"Server running at http://localhost:{port}")
     try:
-        httpd.serve_forever()
+        with asyncio.Runner(loop_factory=new_event_loop) as runner:
+            runner.run(serve(port))
     except KeyboardInterrupt:
         logger.info("Shutting down server...")
-        httpd.shutdown()
 
 if __name__ == "__main__":
     # Get port from environment variable or use default
@@ -9,10 +9,15 @@ import re
 import logging
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Plans are scanned as raw bytes; the markers are ASCII, so only matches get decoded
+_TITLE_RE = re.compile(rb'^# (.+?)\r?$', re.MULTILINE)
+# A "- [ ]" / "- [x]" line: group 1 is the stripped item, group 2 its mark
+_CHECKLIST_RE = re.compile(rb'^[^\S\n]*(- \[([ xX])\].*?)[^\S\n]*$', re.MULTILINE)
+
 class PlanManager:
     """Manages plan lifecycle and automation."""
     
@@ -20,6 +25,8 @@ class PlanManager:
         self.plans_dir = Path(plans_dir)
         self.unimplemented_dir = self.plans_dir / "unimplemented"
         self.implemented_dir = self.plans_dir / "implemented"
+        # Parsed plans keyed by path, reused while (mtime_ns, size) is unchanged
+        self._cache: Dict[Path, Tuple[int, int, Dict[str, Any]]] = {}
         
         # Ensure directories exist
         self.unimplemented_dir.mkdir(parents=True, exist_ok=True)
@@ -27,37 +34,66 @@ class PlanManager:
     
     def get_unimplemented_plans(self) -> List[Path]:
         """Get all unimplemented plan files."""
-        return list(self.unimplemented_dir.glob("*.md"))
+        return self._prune_cache(self.unimplemented_dir, self._list_md(self.unimplemented_dir))
     
     def get_implemented_plans(self) -> List[Path]:
         """Get all implemented plan files."""
-        return list(self.implemented_dir.glob("*.md"))
+        return self._prune_cache(self.implemented_dir, self._list_md(self.implemented_dir))
+    
+    @staticmethod
+    def _list_md(directory: Path) -> List[Path]:
+        """List the markdown files directly inside directory."""
+        with os.scandir(directory) as entries:
+            return [Path(entry.path) for entry in entries if entry.name.endswith('.md') and entry.is_file()]
+    
+    def _prune_cache(self, directory: Path, plans: List[Path]) -> List[Path]:
+        """Drop cached entries for plans that are no longer in directory."""
+        current = set(plans)
+        for path in [path for path in self._cache if path.parent == directory and path not in current]:
+            del self._cache[path]
+        return plans
     
     def parse_plan_file(self, file_path: Path) -> Dict[str, Any]:
-        """Parse a plan markdown file and extract metadata."""
+        """Parse a plan markdown file and extract metadata, reusing the result while the file is unchanged.
+        
+        Returns a shallow copy, so callers can't alter the cached entry.
+        """
+        try:
+            st = file_path.stat()
+        except OSError as e:
+            logger.error(f"Error parsing plan file {file_path}: {e}")
+            return self._empty_plan(file_path)
+        
+        cached = self._cache.get(file_path)
+        if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            return dict(cached[2])
+        
+        plan_data = self._parse_plan_content(file_path)
+        if plan_data is not None:
+            self._cache[file_path] = (st.st_mtime_ns, st.st_size, plan_data)
+            return dict(plan_data)
+        return self._empty_plan(file_path)
+    
+    def _parse_plan_content(self, file_path: Path) -> Dict[str, Any]:
+        """Read and parse a plan file; returns None if it can't be read."""
         try:
-            content = file_path.read_text(encoding='utf-8')
+            data = file_path.read_bytes()
             
             # Extract title
-            title_match = re.search(r'^# (.+)$', content, re.MULTILINE)
-            title = title_match.group(1) if title_match else file_path.stem
+            title_match = _TITLE_RE.search(data)
+            title = title_match.group(1).decode('utf-8', 'replace') if title_match else file_path.stem
             
             # Extract completion checklist
-            checklist_items = []
-            for line in content.split('\n'):
-                if line.strip().startswith('- [x]') or line.strip().startswith('- [X]'):
-                    checklist_items.append(line.strip())
-                elif line.strip().startswith('- [ ]'):
-                    checklist_items.append(line.strip())
+            matches = _CHECKLIST_RE.findall(data)
+            checklist_items = [item.decode('utf-8', 'replace') for item, _ in matches]
             
             # Count completed vs total items
-            completed = len([item for item in checklist_items if item.startswith('- [x]') or item.startswith('- [X]')])
+            completed = sum(1 for _, mark in matches if mark != b' ')
             total = len(checklist_items)
             
             return {
                 'file_path': file_path,
                 'title': title,
-                'content': content,
                 'checklist_items': checklist_items,
                 'completed_count': completed,
                 'total_count': total,
@@ -66,15 +102,19 @@ class PlanManager:
             
         except Exception as e:
             logger.error(f"Error parsing plan file {file_path}: {e}")
-            return {
-                'file_path': file_path,
-                'title': file_path.stem,
-                'content': '',
-                'checklist_items': [],
-                'completed_count': 0,
-                'total_count': 0,
-                'completion_percentage': 0
-            }
+            return None
+    
+    @staticmethod
+    def _empty_plan(file_path: Path) -> Dict[str, Any]:
+        """Metadata for a plan file that couldn't be parsed."""
+        return {
+            'file_path': file_path,
+            'title': file_path.stem,
+            'checklist_items': [],
+            'completed_count': 0,
+            'total_count': 0,
+            'completion_percentage': 0
+        }
     
     def is_plan_complete(self, plan_data: Dict[str, Any]) -> bool:
         """Check if a plan is complete based on its checklist."""
@@ -87,15 +127,19 @@ class PlanManager:
             source_path = plan_data['file_path']
             dest_path = self.implemented_dir / source_path.name
             
-            # Add completion timestamp to the content
+            # Append the completion trailer in place, then rename the file into implemented/
             completion_timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            updated_content = plan_data['content'] + f"\n\n---\n\n**Completed on:** {completion_timestamp}\n**Status:** Implemented"
-            
-            # Write updated content to destination
-            dest_path.write_text(updated_content, encoding='utf-8')
+            trailer = f"\n\n---\n\n**Completed on:** {completion_timestamp}\n**Status:** Implemented"
+            with open(source_path, 'ab') as f:
+                original_size = f.tell()
+                f.write(trailer.encode('utf-8'))
             
-            # Remove source file
-            source_path.unlink()
+            try:
+                os.replace(source_path, dest_path)
+            except OSError:
+                # Leave the unimplemented plan as it was so the next check can retry
+                os.truncate(source_path, original_size)
+                raise
             
             logger.info(f"Moved plan '{plan_data['title']}' to implemented")
             return True
@@ -119,6 +163,7 @@ class PlanManager:
     
     def get_plan_status_summary(self) -> Dict[str, Any]:
         """Get a summary of plan status."""
+        # parse_plan_file is cached per file, so repeated summaries don't re-read unchanged plans
         unimplemented_plans = [self.parse_plan_file(f) for f in self.get_unimplemented_plans()]
         implemented_plans = [self.parse_plan_file(f) for f in self.get_implemented_plans()]
         
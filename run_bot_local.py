@@ -8,10 +8,10 @@ and process messages through the GPT → Airtable pipeline.
 
 import os
 import asyncio
+import orjson
 import uvicorn
 from dotenv import load_dotenv
-from fastapi import FastAPI, Request, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, Request, Response, HTTPException
 import logging
 
 # Load environment variables
@@ -101,20 +101,23 @@ async def health_check():
 @app.post("/telegram-webhook")
 async def telegram_webhook(request: Request):
     """Handle Telegram webhook requests."""
+    # Get the webhook data
+    try:
+        webhook_data = orjson.loads(await request.body())
+    except orjson.JSONDecodeError:
+        raise HTTPException(status_code=400, detail="Invalid JSON body")
+    
     try:
-        # Get the webhook data
-        webhook_data = await request.json()
-        
         # Extract message
         if "message" not in webhook_data:
-            return JSONResponse({"status": "ok", "message": "No message in webhook"})
+            return {"status": "ok", "message": "No message in webhook"}
         
         message = webhook_data["message"]
         chat_id = message.get("chat", {}).get("id")
         text = message.get("text", "")
         
         if not text:
-            return JSONResponse({"status": "ok", "message": "No text in message"})
+            return {"status": "ok", "message": "No text in message"}
         
         print(f"📝 Received message from chat {chat_id}: {text}")
         
@@ -125,38 +128,45 @@ async def telegram_webhook(request: Request):
         if telegram_handler:
             try:
                 await telegram_handler.send_message(chat_id, response_text)
-                print(f"🤖 Sent to Telegram: {response_text}")
+                print(f"🤖 Queued for Telegram: {response_text}")
             except Exception as e:
-                print(f"❌ Failed to send to Telegram: {e}")
+                print(f"❌ Failed to queue for Telegram: {e}")
         
-        return JSONResponse({"status": "ok", "response": response_text})
+        return {"status": "ok", "response": response_text}
         
     except Exception as e:
         print(f"❌ Error processing webhook: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/test-message")
-async def test_message(request: Request):
+async def test_message(request: Request, response: Response):
     """Test endpoint for processing messages without Telegram."""
     try:
-        data = await request.json()
+        data = orjson.loads(await request.body())
+    except orjson.JSONDecodeError:
+        response.status_code = 400
+        return {"error": "Invalid JSON body"}
+    
+    try:
         message = data.get("message", "")
         
         if not message:
-            return JSONResponse({"error": "No message provided"}, status_code=400)
+            response.status_code = 400
+            return {"error": "No message provided"}
         
         print(f"🧪 Testing message: {message}")
         response_text = await process_message(message)
         
-        return JSONResponse({
+        return {
             "message": message,
             "response": response_text,
             "status": "success"
-        })
+        }
         
     except Exception as e:
         print(f"❌ Error testing message: {e}")
-        return JSONResponse({"error": str(e)}, status_code=500)
+        response.status_code = 500
+        return {"error": str(e)}
 
 async def process_message(message: str) -> str:
     """Process a message through the full pipeline."""
@@ -242,13 +252,21 @@ def main():
     print("\n⏹️  Press Ctrl+C to stop the server")
     print("=" * 50)
     
+    # PROD=1 trades auto-reload for uvloop (where installed), the httptools parser and one worker per CPU
+    if os.getenv('PROD') == '1':
+        server_options = {"loop": "auto", "http": "httptools", "workers": os.cpu_count()}
+    else:
+        server_options = {"reload": True}
+    
     try:
         uvicorn.run(
             "run_bot_local:app",
             host="0.0.0.0",
             port=8000,
-            reload=True,
-            log_level="info"
+            log_level="info",
+            # Requests are already logged by the handlers' own prints
+            access_log=False,
+            **server_options
         )
     except KeyboardInterrupt:
         print("\n👋 Bot stopped")
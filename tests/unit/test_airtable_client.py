@@ -0,0 +1,131 @@
+"""
+Unit tests for the Airtable client's batched writes, against a mock HTTP transport.
+"""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from api import airtable_client
+from api.airtable_client import AirtableClient, MAX_RECORDS_PER_REQUEST
+from utils.retry_utils import RetryConfig
+
+TASK = {"task_title": "Inspect pumps"}
+
+class FakeAirtable:
+    """Mock transport handler that records each create request's size."""
+
+    def __init__(self, statuses=(), drop=0):
+        # Error statuses returned to the first requests, in order; later requests succeed
+        self.statuses = list(statuses)
+        # Number of records to leave out of each response
+        self.drop = drop
+        self.posts = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        records = json.loads(request.content)["records"]
+        self.posts.append(len(records))
+        if self.statuses:
+            return httpx.Response(self.statuses.pop(0), json={"error": "failed"})
+        created = [{"id": f"rec{len(self.posts)}_{i}"} for i in range(len(records) - self.drop)]
+        return httpx.Response(200, json={"records": created})
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(airtable_client, "AIRTABLE_RETRY_CONFIG", RetryConfig(base_delay=0, jitter=False))
+    return AirtableClient("key", "appTest", max_batch_ms=50)
+
+async def _use_transport(client: AirtableClient, handler):
+    """Bind the client to the running loop, then swap its HTTP client for a mock."""
+    client._bind_loop()
+    await client._http.aclose()
+    client._http = httpx.AsyncClient(base_url="https://api.airtable.com/v0", transport=httpx.MockTransport(handler))
+
+def test_single_create(client):
+    airtable = FakeAirtable()
+
+    async def run():
+        await _use_transport(client, airtable)
+        try:
+            return await client.create_task(TASK)
+        finally:
+            await client.aclose()
+
+    assert asyncio.run(run()) == "rec1_0"
+    assert airtable.posts == [1]
+
+def test_burst_is_batched(client):
+    airtable = FakeAirtable()
+
+    async def run():
+        await _use_transport(client, airtable)
+        try:
+            return await asyncio.gather(*(client.create_task(TASK) for _ in range(12)))
+        finally:
+            await client.aclose()
+
+    record_ids = asyncio.run(run())
+    assert len(set(record_ids)) == 12
+    assert sum(airtable.posts) == 12
+    assert max(airtable.posts) <= MAX_RECORDS_PER_REQUEST
+    assert len(airtable.posts) < 12
+
+def test_short_response_fails_whole_batch(client):
+    # Records can't be matched to callers, so every create fails instead of waiting forever
+    airtable = FakeAirtable(drop=1)
+
+    async def run():
+        await _use_transport(client, airtable)
+        try:
+            return await asyncio.wait_for(
+                asyncio.gather(*(client.create_task(TASK) for _ in range(3))),
+                timeout=5
+            )
+        finally:
+            await client.aclose()
+
+    assert asyncio.run(run()) == [None, None, None]
+    assert airtable.posts == [3]
+
+def test_rate_limit_is_retried(client):
+    airtable = FakeAirtable(statuses=[429])
+
+    async def run():
+        await _use_transport(client, airtable)
+        try:
+            return await client.create_task(TASK)
+        finally:
+            await client.aclose()
+
+    assert asyncio.run(run()) == "rec2_0"
+    assert airtable.posts == [1, 1]
+
+def test_server_error_is_not_retried(client):
+    airtable = FakeAirtable(statuses=[502])
+
+    async def run():
+        await _use_transport(client, airtable)
+        try:
+            return await client.create_task(TASK)
+        finally:
+            await client.aclose()
+
+    # Airtable may have created the record before failing, so it isn't sent again
+    assert asyncio.run(run()) is None
+    assert airtable.posts == [1]
+
+def test_close_fails_queued_writes(client):
+    async def slow(request):
+        await asyncio.sleep(10)
+        return httpx.Response(200, json={"records": []})
+
+    async def run():
+        await _use_transport(client, slow)
+        pending = [asyncio.create_task(client.create_task(TASK)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        await client.aclose()
+        return await asyncio.wait_for(asyncio.gather(*pending), timeout=5)
+
+    assert asyncio.run(run()) == [None, None, None]
@@ -0,0 +1,57 @@
+"""
+Unit tests for the GPT parser's local helpers.
+"""
+
+from datetime import date
+
+import pytest
+
+from api import gpt_parser
+from api.gpt_parser import GPTParser, _classify, _next_weekday, split_entries
+
+class _FixedDate(date):
+    """date whose today() is Monday 2025-08-04."""
+
+    @classmethod
+    def today(cls):
+        return cls(2025, 8, 4)
+
+@pytest.fixture
+def monday(monkeypatch):
+    monkeypatch.setattr(gpt_parser, "date", _FixedDate)
+
+def test_split_entries_strips_and_drops_empty():
+    assert split_entries("  paid 500 ; ;fuel 20 liters;  ") == ["paid 500", "fuel 20 liters"]
+
+def test_split_entries_single():
+    assert split_entries("paid 500") == ["paid 500"]
+
+def test_classify_single_type():
+    assert _classify("Paid 15,000 MWK for filters") == {"expense"}
+
+def test_classify_multiple_types():
+    assert _classify("Urgent: Hilux needs fuel") == {"fuel", "issue"}
+
+def test_classify_overlapping_keywords():
+    # "gas" sits inside "gasket"; every position is checked, not just word starts
+    assert "fuel" in _classify("replaced the gasket")
+
+def test_classify_no_keywords():
+    assert _classify("hello there") == set()
+
+@pytest.mark.parametrize("weekday, expected", [
+    (0, date(2025, 8, 11)),  # today's weekday means next week
+    (1, date(2025, 8, 5)),
+    (4, date(2025, 8, 8)),
+    (6, date(2025, 8, 10)),
+])
+def test_next_weekday(monday, weekday, expected):
+    assert _next_weekday(weekday) == expected
+
+def test_messages_keep_date_out_of_static_prefix(monday):
+    parser = GPTParser("sk-test", model="gpt-4o-mini")
+    messages = parser._messages("paid 500")
+
+    assert messages[0] is gpt_parser._SYSTEM_MESSAGE
+    assert messages[1] == {"role": "system", "content": "Today is Monday 2025-08-04."}
+    assert messages[-1] == {"role": "user", "content": "paid 500"}
@@ -0,0 +1,56 @@
+"""
+Unit tests for outgoing message batching.
+"""
+
+import asyncio
+
+from utils.outbox import Outbox, pack_messages
+
+def test_pack_messages_joins_with_newlines():
+    assert pack_messages(["a", "b", "c"]) == ["a\nb\nc"]
+
+def test_pack_messages_starts_new_chunk_at_limit():
+    assert pack_messages(["aaa", "bbb", "c"], limit=7) == ["aaa\nbbb", "c"]
+
+def test_pack_messages_splits_oversized_message():
+    assert pack_messages(["ab", "x" * 10, "cd"], limit=4) == ["ab", "xxxx", "xxxx", "xx", "cd"]
+
+def test_pack_messages_empty():
+    assert pack_messages([]) == []
+
+def test_outbox_batches_per_chat():
+    sent = []
+
+    async def send(chat_id, text):
+        sent.append((chat_id, text))
+
+    async def run():
+        outbox = Outbox(send, flush_interval=0.01)
+        outbox.put(1, "a")
+        outbox.put(2, "b")
+        outbox.put(1, "c")
+        assert len(outbox) == 3
+        await outbox.drain()
+        assert len(outbox) == 0
+
+    asyncio.run(run())
+    assert sorted(sent) == [(1, "a\nc"), (2, "b")]
+
+def test_outbox_failed_send_does_not_stop_flusher():
+    sent = []
+
+    async def send(chat_id, text):
+        if chat_id == 1:
+            raise RuntimeError("blocked")
+        sent.append((chat_id, text))
+
+    async def run():
+        outbox = Outbox(send, flush_interval=0.01)
+        outbox.put(1, "a")
+        outbox.put(2, "b")
+        await outbox.drain()
+        outbox.put(2, "c")
+        await outbox.drain()
+
+    asyncio.run(run())
+    assert sent == [(2, "b"), (2, "c")]
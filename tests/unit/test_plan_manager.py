@@ -0,0 +1,77 @@
+"""
+Unit tests for plan parsing and the plan manager's parse cache.
+"""
+
+import os
+
+import pytest
+
+from plans.plan_manager import PlanManager, _CHECKLIST_RE
+
+@pytest.fixture
+def manager(tmp_path):
+    return PlanManager(str(tmp_path))
+
+def _write_plan(manager, name, text):
+    path = manager.unimplemented_dir / name
+    path.write_bytes(text.encode("utf-8"))
+    return path
+
+def test_checklist_re_matches_items_and_marks():
+    data = b"# Plan\n- [ ] open\n  - [x] done  \r\n- [X] also done\n"
+    assert _CHECKLIST_RE.findall(data) == [
+        (b"- [ ] open", b" "),
+        (b"- [x] done", b"x"),
+        (b"- [X] also done", b"X"),
+    ]
+
+def test_checklist_re_ignores_other_lines():
+    data = b"* [x] star bullet\n- [y] bad mark\ntext - [x] inline\n-[x] no space\n"
+    assert _CHECKLIST_RE.findall(data) == []
+
+def test_parse_plan_file(manager):
+    path = _write_plan(manager, "plan.md", "# My Plan\n\n- [x] one\n- [ ] two\n")
+    plan = manager.parse_plan_file(path)
+
+    assert plan["title"] == "My Plan"
+    assert plan["checklist_items"] == ["- [x] one", "- [ ] two"]
+    assert (plan["completed_count"], plan["total_count"]) == (1, 2)
+    assert plan["completion_percentage"] == 50
+
+def test_parse_plan_file_reuses_cache_until_file_changes(manager):
+    path = _write_plan(manager, "plan.md", "# Plan\n- [ ] one\n")
+    assert manager.parse_plan_file(path)["completed_count"] == 0
+
+    # Same size and mtime: the cached parse is used even though the bytes differ
+    st = path.stat()
+    path.write_bytes(b"# Plan\n- [x] one\n")
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+    assert manager.parse_plan_file(path)["completed_count"] == 0
+
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert manager.parse_plan_file(path)["completed_count"] == 1
+
+def test_parse_plan_file_returns_copy(manager):
+    path = _write_plan(manager, "plan.md", "# Plan\n- [ ] one\n")
+    manager.parse_plan_file(path)["title"] = "changed"
+    assert manager.parse_plan_file(path)["title"] == "Plan"
+
+def test_status_summary(manager):
+    _write_plan(manager, "a.md", "# A\n- [x] one\n- [ ] two\n")
+    _write_plan(manager, "b.md", "# B\n- [x] one\n")
+    summary = manager.get_plan_status_summary()
+
+    assert summary["unimplemented_count"] == 2
+    assert sorted(summary["unimplemented_plans"]) == ["A", "B"]
+    assert summary["completion_stats"] == {
+        "total_completed_items": 2,
+        "total_items": 3,
+        "overall_completion": 75.0,
+    }
+
+def test_cache_pruned_when_plan_removed(manager):
+    path = _write_plan(manager, "plan.md", "# Plan\n- [ ] one\n")
+    manager.get_plan_status_summary()
+    path.unlink()
+    manager.get_plan_status_summary()
+    assert path not in manager._cache
@@ -0,0 +1,43 @@
+"""
+Unit tests for the retry helpers.
+"""
+
+import asyncio
+
+import pytest
+
+from utils.retry_utils import RetryConfig, retry_async
+
+NO_DELAY = RetryConfig(max_attempts=3, base_delay=0, jitter=False)
+
+def _failing(errors):
+    """Async callable raising each of errors in turn, then returning its call count."""
+    calls = []
+
+    async def func():
+        calls.append(None)
+        if len(calls) <= len(errors):
+            raise errors[len(calls) - 1]
+        return len(calls)
+
+    return func, calls
+
+def test_retries_until_success():
+    func, calls = _failing([ValueError("a"), ValueError("b")])
+    assert asyncio.run(retry_async(func, config=NO_DELAY)) == 3
+
+def test_raises_last_error_after_max_attempts():
+    func, calls = _failing([ValueError("a"), ValueError("b"), ValueError("c")])
+    with pytest.raises(ValueError, match="c"):
+        asyncio.run(retry_async(func, config=NO_DELAY))
+    assert len(calls) == 3
+
+def test_retry_on_limits_retried_exceptions():
+    func, calls = _failing([KeyError("not retried")])
+    with pytest.raises(KeyError):
+        asyncio.run(retry_async(func, config=NO_DELAY, retry_on=(ValueError,)))
+    assert len(calls) == 1
+
+def test_retry_on_retries_matching_exceptions():
+    func, calls = _failing([ConnectionError("down")])
+    assert asyncio.run(retry_async(func, config=NO_DELAY, retry_on=(ConnectionError,))) == 2
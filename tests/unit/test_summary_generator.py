@@ -0,0 +1,37 @@
+"""
+Unit tests for the summary generator's record views.
+"""
+
+import pytest
+
+from api.summary_generator import FrozenRecord
+
+def test_frozen_record_reads_like_a_dict():
+    record = FrozenRecord({"amount": 500, "description": "Filters"})
+    assert record["amount"] == 500
+    assert dict(record) == {"amount": 500, "description": "Filters"}
+    assert len(record) == 2
+
+def test_frozen_record_freezes_nested_values():
+    record = FrozenRecord({"tags": ["a", "b"], "meta": {"ids": [1, 2]}})
+    assert record["tags"] == ("a", "b")
+    assert isinstance(record["meta"], FrozenRecord)
+    assert record["meta"]["ids"] == (1, 2)
+
+def test_frozen_record_is_hashable():
+    first = FrozenRecord({"tags": ["a"], "amount": 1})
+    second = FrozenRecord({"amount": 1, "tags": ["a"]})
+    assert first == second
+    assert hash(first) == hash(second)
+    assert len({first, second}) == 1
+
+def test_frozen_record_is_read_only():
+    record = FrozenRecord({"amount": 1})
+    with pytest.raises(TypeError):
+        record["amount"] = 2
+
+def test_frozen_record_does_not_share_source():
+    source = {"amount": 1}
+    record = FrozenRecord(source)
+    source["amount"] = 2
+    assert record["amount"] == 1
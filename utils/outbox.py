@@ -0,0 +1,80 @@
+"""
+Outgoing message batching for the service station operations bot.
+
+Buffers replies per chat and sends each chat's pending messages as one Telegram message.
+"""
+
+import asyncio
+import logging
+from collections import defaultdict
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+# Telegram rejects sendMessage texts longer than this
+TELEGRAM_MAX_MESSAGE_LENGTH = 4096
+
+logger = logging.getLogger(__name__)
+
+class Outbox:
+    """Per-chat message buffer flushed on a fixed interval."""
+    
+    def __init__(self, send: Callable[[int, str], Awaitable[Any]], flush_interval: float = 0.3):
+        self.send = send
+        self.flush_interval = flush_interval
+        self._pending: Dict[int, List[str]] = defaultdict(list)
+        self._flush_task: Optional[asyncio.Task] = None
+    
+    def put(self, chat_id: int, text: str):
+        """Queue a message; it is sent with the chat's other pending messages on the next flush."""
+        self._pending[chat_id].append(text)
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.get_running_loop().create_task(self._flusher())
+    
+    async def drain(self):
+        """Wait until every queued message has been sent."""
+        if self._flush_task is not None and not self._flush_task.done():
+            await self._flush_task
+    
+    async def _flusher(self):
+        """Send queued messages every flush interval until nothing is pending."""
+        while self._pending:
+            await asyncio.sleep(self.flush_interval)
+            pending, self._pending = self._pending, defaultdict(list)
+            sends = [
+                (chat_id, chunk)
+                for chat_id, texts in pending.items()
+                for chunk in pack_messages(texts)
+            ]
+            # One failed send must not stop the others, or the flusher itself
+            results = await asyncio.gather(
+                *(self.send(chat_id, chunk) for chat_id, chunk in sends),
+                return_exceptions=True
+            )
+            for (chat_id, _), result in zip(sends, results):
+                if isinstance(result, Exception):
+                    logger.error(f"Failed to send queued message to {chat_id}: {result}")
+    
+    def __len__(self) -> int:
+        return sum(len(texts) for texts in self._pending.values())
+
+def pack_messages(texts: List[str], limit: int = TELEGRAM_MAX_MESSAGE_LENGTH) -> List[str]:
+    """Join messages with newlines into as few texts as fit within limit characters."""
+    chunks = []
+    current = ""
+    for text in texts:
+        # A single oversized message is split on its own
+        while len(text) > limit:
+            if current:
+                chunks.append(current)
+                current = ""
+            chunks.append(text[:limit])
+            text = text[limit:]
+        if not current:
+            current = text
+        elif len(current) + 1 + len(text) <= limit:
+            current = f"{current}\n{text}"
+        else:
+            chunks.append(current)
+            current = text
+    if current:
+        chunks.append(current)
+    return chunks
@@ -7,7 +7,7 @@ Handles retry logic for API calls and external service interactions.
 import logging
 import asyncio
 import random
-from typing import Callable, Any, Optional, TypeVar, Awaitable
+from typing import Callable, Any, Optional, TypeVar, Awaitable, Tuple, Type
 from functools import wraps
 
 logger = logging.getLogger(__name__)
@@ -47,9 +47,13 @@ async def retry_async(
     func: Callable[..., Awaitable[T]],
     *args,
     config: Optional[RetryConfig] = None,
+    retry_on: Tuple[Type[BaseException], ...] = (Exception,),
     **kwargs
 ) -> T:
-    """Retry an async function with exponential backoff."""
+    """Retry an async function with exponential backoff.
+    
+    Only exceptions matching retry_on are retried; anything else is raised immediately.
+    """
     if config is None:
         config = RetryConfig()
     
@@ -58,7 +62,7 @@ async def retry_async(
     for attempt in range(1, config.max_attempts + 1):
         try:
             return await func(*args, **kwargs)
-        except Exception as e:
+        except retry_on as e:
             last_exception = e
             logger.warning(f"Attempt {attempt} failed: {e}")
             
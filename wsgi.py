@@ -3,10 +3,17 @@ WSGI entry point for the Service Station Operations Bot.
 This file serves as an alternative entry point for deployment.
 """
 
-from main import app
+import os
+
+import uvicorn
+
+from app import create_app
+
+# Serves the full app unless APP_MODE says otherwise
+app = create_app(os.getenv("APP_MODE", "full"))
 
 # For WSGI servers that expect this variable
 application = app
 
 if __name__ == "__main__":
-    app.run()
+    uvicorn.run(app, host="0.0.0.0", port=int(os.getenv("PORT", "8000")))